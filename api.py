@@ -4,76 +4,185 @@ FastAPI Server for YouTube Research Assistant
 Provides API endpoints to query research.db and trigger video processing
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Query
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Query, Depends
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 from pathlib import Path
-import subprocess
+from functools import lru_cache
+from itertools import chain
+from contextlib import asynccontextmanager
+import asyncio
 import sqlite3
 import os
 
-from db_manager import search_videos, get_stats, DB_PATH
+import orjson
+
+# Load API keys from .env, as check_once.py does for scheduled runs
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    print("Note: python-dotenv not installed. Using environment variables only.")
+
+from db_manager import (search_videos, get_stats, get_video_by_id, reader, init_database,
+                        DB_PATH, JSON_FIELDS)
+from youtube_monitor import YouTubeMonitor, load_profile, QuotaExceededError
+
+PROFILES_DIR = Path(__file__).parent / "profiles"
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Bring an existing database's schema up to date before serving requests.
+
+    /stats, /channels and /digest read tables and triggers that init_database()
+    adds, and otherwise only the monitor runs it. A no-op once the schema is
+    current.
+    """
+    if DB_PATH.exists():
+        init_database()
+    yield
+
 
 app = FastAPI(
+    lifespan=lifespan,
     title="YouTube Research Assistant API",
     description="Query video summaries and trigger processing",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson encodes the long summary payloads several times faster than json.dumps
+    default_response_class=ORJSONResponse
 )
 
-# Enable CORS
+# Enable CORS for the dashboard origin(s) in CORS_ORIGINS (comma-separated,
+# defaults to "*"). No cookies are used, so credentials stay off, and browsers
+# may cache the preflight response for a day.
+CORS_ORIGINS = [o.strip() for o in os.getenv('CORS_ORIGINS', '*').split(',') if o.strip()]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
+    allow_origins=CORS_ORIGINS,
+    allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,
 )
 
 # Background task tracking
 processing_status = {
     "is_processing": False,
     "last_run": None,
-    "last_result": None
+    "last_result": None,
+    "progress": None
 }
 
+# Reference to the running ingest task so it isn't garbage-collected mid-run
+_ingest_task = None
+
+# Hard limit per profile, matching check_once.py: yt-dlp downloads and Gemini
+# calls have no connect/read deadlines of their own
+INGEST_TIMEOUT_SECONDS = 1800  # 30 minutes
+
+
+def _raw_json(value):
+    """Embed a stored JSON column in an ORJSONResponse without re-encoding it."""
+    return None if value is None else orjson.Fragment(value)
 
-def run_youtube_monitor():
-    """Background task to run youtube_monitor.py"""
+
+def _require_db():
+    """Answer 503 until the monitor has created the database."""
+    if not DB_PATH.exists():
+        raise HTTPException(status_code=503, detail="Database not found. Run /ingest first.")
+
+
+def get_db():
+    """FastAPI dependency: check out a pooled read-only connection for one request.
+
+    Handlers that query the database are plain `def` functions: FastAPI runs them
+    in its threadpool, so a slow SQLite query never blocks the event loop (and the
+    /ingest task running on it).
+    """
+    _require_db()
+    with reader() as conn:
+        yield conn
+
+
+async def run_youtube_monitor(profile_names):
+    """Run YouTubeMonitor.check_channels in-process for each profile.
+
+    check_channels is blocking (googleapiclient, yt-dlp, Gemini), so it runs in a
+    worker thread; progress is reported into processing_status as it goes.
+    """
     global processing_status
     
     processing_status["is_processing"] = True
     processing_status["last_run"] = datetime.now().isoformat()
+    processing_status["progress"] = None
+    completed = []
+    
+    def check_profile(profile_name):
+        def report_progress(**progress):
+            processing_status["progress"] = {"profile": profile_name, **progress}
+        
+        report_progress(channel=None, summaries=0)
+        try:
+            profile_config = load_profile(profile_name)
+        except SystemExit:
+            # load_profile exits on a malformed profile; don't let that kill the server
+            raise ValueError(f"Profile '{profile_name}' is missing or malformed")
+        monitor = YouTubeMonitor(profile_name, profile_config)
+        monitor.check_channels(progress_callback=report_progress)
     
+    worker = None
     try:
-        # Run the monitor script
-        result = subprocess.run(
-            ["python", "check_once.py"],
-            capture_output=True,
-            text=True,
-            timeout=1800  # 30 minute timeout
-        )
+        for profile_name in profile_names:
+            # shield() keeps the timeout from cancelling the worker future: the
+            # thread can't be killed anyway, and finally needs to know when it
+            # really returns
+            worker = asyncio.ensure_future(asyncio.to_thread(check_profile, profile_name))
+            await asyncio.wait_for(asyncio.shield(worker), timeout=INGEST_TIMEOUT_SECONDS)
+            completed.append(profile_name)
         
         processing_status["last_result"] = {
-            "success": result.returncode == 0,
-            "stdout": result.stdout[-1000:] if result.stdout else "",  # Last 1000 chars
-            "stderr": result.stderr[-1000:] if result.stderr else "",
-            "return_code": result.returncode
+            "success": True,
+            "profiles": completed
         }
         
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
+        processing_status["last_result"] = {
+            "success": False,
+            "profiles": completed,
+            "error": f"Run exceeded {INGEST_TIMEOUT_SECONDS}s hard limit — "
+                     "yt-dlp or Gemini API hung. Stopped waiting; new ingests "
+                     "are refused until the stuck run returns."
+        }
+    except QuotaExceededError as e:
         processing_status["last_result"] = {
             "success": False,
-            "error": "Processing timeout (30 minutes exceeded)"
+            "profiles": completed,
+            "error": f"API quota exhausted: {e}"
         }
     except Exception as e:
         processing_status["last_result"] = {
             "success": False,
+            "profiles": completed,
             "error": str(e)
         }
     finally:
-        processing_status["is_processing"] = False
+        if worker is not None and not worker.done():
+            # Timed out: the thread is still calling YouTube / Gemini and writing
+            # processed marks, so refuse new ingests until it actually returns
+            worker.add_done_callback(_finish_timed_out_run)
+        else:
+            processing_status["is_processing"] = False
+
+
+def _finish_timed_out_run(worker):
+    """Done-callback for a timed-out profile run: clear the ingest lock."""
+    if not worker.cancelled() and worker.exception() is not None:
+        print(f"Timed-out ingest run finished with an error: {worker.exception()}")
+    processing_status["is_processing"] = False
 
 
 @app.get("/")
@@ -85,7 +194,7 @@ async def root():
         "endpoints": {
             "ask": "/ask?q=<query>&days=<days>",
             "digest": "/digest?days=<days>",
-            "ingest": "POST /ingest",
+            "ingest": "POST /ingest?profile=<profile>",
             "status": "/status",
             "stats": "/stats"
         }
@@ -93,31 +202,31 @@ async def root():
 
 
 @app.get("/ask")
-async def ask(
+def ask(
     q: str = Query(..., description="Search query"),
     days: Optional[int] = Query(None, description="Filter videos from last N days"),
-    limit: int = Query(10, description="Maximum results", ge=1, le=100)
+    limit: int = Query(10, description="Maximum results", ge=1, le=100),
+    preview: bool = Query(False, description="Return a highlighted excerpt instead of the full summary"),
+    conn: sqlite3.Connection = Depends(get_db)
 ):
     """
-    Semantic keyword search across video summaries.
+    Keyword search across video summaries, ranked by relevance and recency.
     
     Searches video titles, summaries, topics, recommendations, and action items.
     
-    Example: /ask?q=TSLA&days=7&limit=5
+    Example: /ask?q=TSLA&days=7&limit=5&preview=true
     """
-    if not DB_PATH.exists():
-        raise HTTPException(status_code=503, detail="Database not found. Run /ingest first.")
-    
     # Calculate from_date if days parameter provided
     from_date = None
     if days:
-        from_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        from_date = (datetime.now() - timedelta(days=days)).date().isoformat()
     
     try:
         results = search_videos(
             search_term=q,
             from_date=from_date,
-            limit=limit
+            limit=limit,
+            conn=conn
         )
         
         # Format results
@@ -131,10 +240,11 @@ async def ask(
                 "published": video['published_date'],
                 "duration": video.get('duration_seconds', 0),
                 "source_type": video['source_type'],
-                "summary": video['summary_text'],
-                "key_topics": video.get('key_topics'),
-                "recommendations": video.get('recommendations'),
-                "action_items": video.get('action_items')
+                # Listings (a blank q) have no FTS excerpt; fall back to the summary
+                "summary": (preview and video.get('preview')) or video['summary_text'],
+                "key_topics": _raw_json(video['key_topics']),
+                "recommendations": _raw_json(video['recommendations']),
+                "action_items": _raw_json(video['action_items'])
             })
         
         return {
@@ -149,97 +259,172 @@ async def ask(
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
 
+def _db_version(conn):
+    """Cheap fingerprint of the videos table, used as a cache key.
+
+    MAX(id) is a primary-key lookup and videos_meta.total is trigger-maintained,
+    so this changes whenever a video is added or removed without scanning.
+    """
+    row = conn.execute(
+        "SELECT (SELECT MAX(id) FROM videos), (SELECT total FROM videos_meta)"
+    ).fetchone()
+    return tuple(row)
+
+
+# Channel counts for the /digest window (answered from idx_pub_channel)
+_DIGEST_COUNTS_SQL = """
+    SELECT channel_name, COUNT(*) AS n
+    FROM (
+        SELECT channel_name FROM videos
+        WHERE published_date >= ?
+        ORDER BY published_date DESC
+        LIMIT ?
+    )
+    GROUP BY channel_name
+    ORDER BY n DESC, channel_name
+"""
+
+# The same window's videos as ready-made JSON objects, in digest order: channels
+# by video count, then newest first within each channel. The outer ORDER BY is
+# what guarantees that order (json_group_array only honours one from SQLite
+# 3.44), so _stream_digest() groups the rows by channel as they arrive.
+_DIGEST_VIDEOS_SQL = """
+    WITH recent AS (
+        SELECT video_id, video_title, channel_name, video_url, published_date,
+               duration_seconds, source_type, summary_text, key_topics,
+               recommendations, action_items
+        FROM videos
+        WHERE published_date >= ?
+        ORDER BY published_date DESC
+        LIMIT ?
+    )
+    SELECT channel_name,
+           COUNT(*) OVER (PARTITION BY channel_name) AS n,
+           json_object(
+               'video_id', video_id,
+               'title', video_title,
+               'url', video_url,
+               'published', published_date,
+               'duration', COALESCE(duration_seconds, 0),
+               'source_type', source_type,
+               'summary', summary_text,
+               'key_topics', {key_topics},
+               'recommendations', {recommendations},
+               'action_items', {action_items}
+           ) AS video
+    FROM recent
+    ORDER BY n DESC, channel_name, published_date DESC, video_id
+""".format(**{
+    # Embedded as JSON; a value not (yet) migrated to JSON goes in as a string
+    # instead of failing the whole query part-way through the response
+    field: f"CASE WHEN json_valid({field}) THEN json({field}) ELSE {field} END"
+    for field in JSON_FIELDS
+})
+
+DIGEST_LIMIT = 100  # Get up to 100 videos
+
+
+def _stream_digest(days):
+    """Yield the /digest JSON document: the header, then one channel at a time.
+
+    The header's counts and the videos come from one pooled connection inside
+    a single read transaction, so an ingest committing mid-response can't make
+    them disagree.  SQLite encodes each video as JSON itself (json_object), so
+    the rows are written out as-is with no per-video decoding, and only one
+    video's summary is in memory at a time.  The connection is held until the body is finished (or the client
+    goes away), since the request's own is released before the body is sent.
+    """
+    now = datetime.now()
+    from_date = (now - timedelta(days=days)).date().isoformat()
+    
+    with reader() as conn:
+        conn.execute("BEGIN")
+        try:
+            channel_counts = conn.execute(_DIGEST_COUNTS_SQL, (from_date, DIGEST_LIMIT)).fetchall()
+            header = {
+                "period": {
+                    "days": days,
+                    "from": from_date,
+                    "to": now.date().isoformat()
+                },
+                "summary": {
+                    "total_videos": sum(row['n'] for row in channel_counts),
+                    "total_channels": len(channel_counts),
+                    "channels": [
+                        {
+                            "name": row['channel_name'],
+                            "video_count": row['n']
+                        }
+                        for row in channel_counts
+                    ]
+                }
+            }
+            # Header object minus its closing brace, then open videos_by_channel
+            yield orjson.dumps(header)[:-1] + b',"videos_by_channel":{'
+            
+            # Rows arrive grouped by channel; open a new array whenever it changes
+            cursor = conn.execute(_DIGEST_VIDEOS_SQL, (from_date, DIGEST_LIMIT))
+            channel = None
+            for row in cursor:
+                video = row['video'].encode()
+                if row['channel_name'] == channel:
+                    yield b',' + video
+                    continue
+                opener = b'' if channel is None else b'],'
+                channel = row['channel_name']
+                yield opener + orjson.dumps(channel) + b':[' + video
+            if channel is not None:
+                yield b']'
+        finally:
+            conn.rollback()  # end the read transaction before the pool reuses it
+    
+    yield b'}}'
+
+
+@lru_cache(maxsize=4)
+def _build_stats(db_version):
+    """Fetch database statistics; cached until db_version changes."""
+    return get_stats()
+
+
 @app.get("/digest")
-async def digest(
+def digest(
     days: int = Query(7, description="Number of days to include", ge=1, le=90)
 ):
     """
     Get a structured digest of recent videos.
     
     Returns videos from the last N days, grouped by channel with summaries.
+    The response is streamed so large digests are never held in memory at once.
     
     Example: /digest?days=7
     """
-    if not DB_PATH.exists():
-        raise HTTPException(status_code=503, detail="Database not found. Run /ingest first.")
-    
-    from_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-    
+    _require_db()
+    body = _stream_digest(days)
     try:
-        # Get all videos from the time period
-        results = search_videos(
-            from_date=from_date,
-            limit=100  # Get up to 100 videos
-        )
-        
-        # Group by channel
-        by_channel = {}
-        for video in results:
-            channel = video['channel_name']
-            if channel not in by_channel:
-                by_channel[channel] = []
-            
-            by_channel[channel].append({
-                "video_id": video['video_id'],
-                "title": video['video_title'],
-                "url": video['video_url'],
-                "published": video['published_date'],
-                "duration": video.get('duration_seconds', 0),
-                "source_type": video['source_type'],
-                "summary": video['summary_text'],
-                "key_topics": video.get('key_topics'),
-                "recommendations": video.get('recommendations'),
-                "action_items": video.get('action_items')
-            })
-        
-        # Sort channels by number of videos
-        sorted_channels = sorted(
-            by_channel.items(),
-            key=lambda x: len(x[1]),
-            reverse=True
-        )
-        
-        digest_data = {
-            "period": {
-                "days": days,
-                "from": from_date,
-                "to": datetime.now().strftime('%Y-%m-%d')
-            },
-            "summary": {
-                "total_videos": len(results),
-                "total_channels": len(by_channel),
-                "channels": [
-                    {
-                        "name": channel,
-                        "video_count": len(videos)
-                    }
-                    for channel, videos in sorted_channels
-                ]
-            },
-            "videos_by_channel": {
-                channel: videos
-                for channel, videos in sorted_channels
-            }
-        }
-        
-        return digest_data
-        
+        # Runs the count query, so a failure is still reported as a 500 rather
+        # than after the 200 status line has gone out
+        header = next(body)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Digest generation failed: {str(e)}")
+    
+    return StreamingResponse(chain((header,), body), media_type="application/json")
 
 
 @app.post("/ingest")
-async def ingest(background_tasks: BackgroundTasks):
+async def ingest(
+    profile: Optional[str] = Query(None, description="Profile to run (default: all profiles)")
+):
     """
     Trigger the YouTube monitoring pipeline.
     
-    Runs check_once.py in the background to fetch and process new videos.
-    Returns immediately while processing continues in background.
+    Runs the monitor in-process on the server's event loop to fetch and process
+    new videos. Returns immediately while processing continues in background.
     """
-    global processing_status
+    global processing_status, _ingest_task
     
     if processing_status["is_processing"]:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=409,
             content={
                 "status": "already_processing",
@@ -248,12 +433,21 @@ async def ingest(background_tasks: BackgroundTasks):
             }
         )
     
-    # Add background task
-    background_tasks.add_task(run_youtube_monitor)
+    if profile:
+        if not (PROFILES_DIR / f"{profile}.yaml").exists():
+            raise HTTPException(status_code=404, detail=f"Profile '{profile}' not found")
+        profile_names = [profile]
+    else:
+        profile_names = sorted(p.stem for p in PROFILES_DIR.glob("*.yaml"))
+    
+    # Mark as processing before scheduling so a second request gets 409
+    processing_status["is_processing"] = True
+    _ingest_task = asyncio.create_task(run_youtube_monitor(profile_names))
     
     return {
         "status": "started",
         "message": "Video processing started in background",
+        "profiles": profile_names,
         "started_at": datetime.now().isoformat(),
         "note": "Check /status endpoint for progress"
     }
@@ -264,27 +458,26 @@ async def status():
     """
     Get status of video processing pipeline.
     
-    Shows whether processing is currently running and results of last run.
+    Shows whether processing is currently running, live progress of the
+    current run, and results of last run.
     """
     return {
         "is_processing": processing_status["is_processing"],
         "last_run": processing_status["last_run"],
-        "last_result": processing_status["last_result"]
+        "last_result": processing_status["last_result"],
+        "progress": processing_status["progress"]
     }
 
 
 @app.get("/stats")
-async def stats():
+def stats(conn: sqlite3.Connection = Depends(get_db)):
     """
     Get database statistics.
     
     Returns total videos, breakdown by channel, source types, and date range.
     """
-    if not DB_PATH.exists():
-        raise HTTPException(status_code=503, detail="Database not found. Run /ingest first.")
-    
     try:
-        db_stats = get_stats()
+        db_stats = _build_stats(_db_version(conn))
         
         return {
             "total_videos": db_stats['total_videos'],
@@ -298,29 +491,18 @@ async def stats():
 
 
 @app.get("/videos/{video_id}")
-async def get_video(video_id: str):
+def get_video(video_id: str, conn: sqlite3.Connection = Depends(get_db)):
     """
     Get a specific video by YouTube video ID.
     
     Example: /videos/xsoAkbIhM4w
     """
-    if not DB_PATH.exists():
-        raise HTTPException(status_code=503, detail="Database not found. Run /ingest first.")
-    
     try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        video = get_video_by_id(video_id, conn)
         
-        cursor.execute("SELECT * FROM videos WHERE video_id = ?", (video_id,))
-        row = cursor.fetchone()
-        conn.close()
-        
-        if not row:
+        if not video:
             raise HTTPException(status_code=404, detail=f"Video {video_id} not found")
         
-        video = dict(row)
-        
         return {
             "video_id": video['video_id'],
             "title": video['video_title'],
@@ -331,9 +513,9 @@ async def get_video(video_id: str):
             "duration": video.get('duration_seconds', 0),
             "source_type": video['source_type'],
             "summary": video['summary_text'],
-            "key_topics": video.get('key_topics'),
-            "recommendations": video.get('recommendations'),
-            "action_items": video.get('action_items')
+            "key_topics": _raw_json(video['key_topics']),
+            "recommendations": _raw_json(video['recommendations']),
+            "action_items": _raw_json(video['action_items'])
         }
         
     except HTTPException:
@@ -343,15 +525,12 @@ async def get_video(video_id: str):
 
 
 @app.get("/channels")
-async def list_channels():
+def list_channels(conn: sqlite3.Connection = Depends(get_db)):
     """
     List all channels in the database with video counts.
     """
-    if not DB_PATH.exists():
-        raise HTTPException(status_code=503, detail="Database not found. Run /ingest first.")
-    
     try:
-        db_stats = get_stats()
+        db_stats = _build_stats(_db_version(conn))
         
         channels = [
             {
@@ -3,12 +3,29 @@ Database schema for YouTube Research Assistant
 Creates and manages the SQLite database for video summaries
 """
 
+import queue
 import sqlite3
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 
+import orjson
+
 DB_PATH = Path(__file__).parent / "research.db"
 
+# Optional free-form columns stored as canonical JSON text, so readers can hand
+# them to the response encoder as-is instead of decoding and re-encoding them
+JSON_FIELDS = ('key_topics', 'recommendations', 'action_items')
+
+# Idle read-only connections kept open between API requests (roughly one per
+# uvicorn worker thread that is querying at the same time).
+READ_POOL_SIZE = 4
+
+# Bump whenever init_database() gains a table, column, index or migration, so
+# existing databases run the full set-up once more
+SCHEMA_VERSION = 2
+_read_pool = queue.Queue(maxsize=READ_POOL_SIZE)
+
 def _connect():
     """Open a database connection with a generous timeout and WAL journal mode.
 
@@ -17,15 +34,106 @@ def _connect():
     script run at the same time.  The 30-second timeout means a write that can't
     acquire the lock immediately will keep retrying for up to 30 seconds before
     raising OperationalError.
+
+    synchronous=NORMAL is safe under WAL (no corruption on power loss, at worst the
+    last commit is rolled back) and skips the fsync on every commit.  Keep it at
+    NORMAL rather than OFF so a crash can't corrupt the database.
     """
     conn = sqlite3.connect(DB_PATH, timeout=30)
     conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")  # ~20 MB page cache
+    return conn
+
+
+def _connect_readonly():
+    """Open a long-lived read-only connection for the query paths.
+
+    Opened with check_same_thread=False so the API can hand it to whichever
+    worker thread serves the next request; rows come back as sqlite3.Row.
+    The database file is memory-mapped (up to 256 MB) so hot pages are read
+    straight from the OS page cache instead of being copied in by read() calls.
+    Up to 128 prepared statements are kept per connection, enough for every
+    search_videos() filter combination.
+    """
+    conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True, timeout=30,
+                           check_same_thread=False, cached_statements=128)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA busy_timeout=30000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")
+    conn.execute("PRAGMA mmap_size=268435456")
     return conn
 
 
+@contextmanager
+def reader():
+    """Check a read-only connection out of the pool, returning it when done.
+
+    Reusing connections keeps SQLite's page cache warm and skips re-parsing the
+    schema on every request.  The writer (insert_video_summary) always uses its
+    own connection from _connect(), so WAL readers never wait on it.
+    """
+    try:
+        conn = _read_pool.get_nowait()
+    except queue.Empty:
+        conn = _connect_readonly()
+    try:
+        yield conn
+    finally:
+        try:
+            _read_pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+
+_conn = None
+
+def get_conn():
+    """Return the process-wide read-only connection, opening it on first use.
+
+    For one-shot callers such as the query_db CLI, which run all of their
+    queries on a single connection instead of checking one out per call.
+    """
+    global _conn
+    if _conn is None:
+        _conn = _connect_readonly()
+        _conn.execute("PRAGMA query_only=ON")
+    return _conn
+
+
+# Columns of the videos_fts full-text index, in order
+_FTS_COLUMNS = "video_title, summary_text, key_topics, recommendations, action_items"
+
+def _fts_text(column):
+    """SQL for the searchable text of a JSON_FIELDS column.
+    
+    The index gets the decoded strings (array/object values joined by spaces)
+    rather than the JSON text, where escapes such as \\n would glue words
+    together.
+    """
+    return (f"CASE WHEN json_valid({column}) THEN (SELECT group_concat(atom, ' ') "
+            f"FROM json_tree({column}) WHERE atom IS NOT NULL) ELSE {column} END")
+
+def _fts_values(row):
+    """SQL for the videos_fts column values of `row` (new, old or a table name)."""
+    return ", ".join([f"{row}.video_title", f"{row}.summary_text"] +
+                     [_fts_text(f"{row}.{field}") for field in JSON_FIELDS])
+
 def init_database():
-    """Initialize the database with required tables."""
+    """Initialize the database with required tables.
+    
+    The full set-up (migrations scan every row, then ANALYZE) runs only while
+    the database's user_version is below SCHEMA_VERSION; afterwards this is a
+    single PRAGMA read.
+    """
     conn = _connect()
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version >= SCHEMA_VERSION:
+        conn.close()
+        return
     cursor = conn.cursor()
     
     # Create videos table
@@ -44,13 +152,22 @@ def init_database():
             recommendations TEXT,
             action_items TEXT,
             duration_seconds INTEGER,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            transcript_text TEXT
         )
     """)
     
-    # Create index for faster searches
+    # Databases created before transcripts were stored lack the column
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(videos)")}
+    if 'transcript_text' not in columns:
+        cursor.execute("ALTER TABLE videos ADD COLUMN transcript_text TEXT")
+    
+    # Create index for faster searches. Channel lookups also order by date, so
+    # the channel index carries published_date (it replaces the older
+    # channel-only idx_channel_name, whose lookups it covers).
+    cursor.execute("DROP INDEX IF EXISTS idx_channel_name")
     cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_channel_name ON videos(channel_name)
+        CREATE INDEX IF NOT EXISTS idx_channel_published ON videos(channel_name, published_date DESC)
     """)
     
     cursor.execute("""
@@ -61,46 +178,228 @@ def init_database():
         CREATE INDEX IF NOT EXISTS idx_video_id ON videos(video_id)
     """)
     
-    # Create full-text search virtual table
+    # Newest-first date range scans for /digest and list queries, carrying the
+    # columns those listings show so the scan can stay inside the index
     cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_pub_channel
+        ON videos(published_date DESC, channel_name, video_id, video_title)
+    """)
+    
+    # The FTS triggers are (re)created below; drop the old ones first so the
+    # JSON migration doesn't fire them
+    for trigger in ('videos_ai', 'videos_ad', 'videos_au'):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    
+    # Full-text search index. remove_diacritics lets "resume" match "résumé";
+    # indexes built before version 2 (without it, or holding raw JSON_FIELDS
+    # text) are dropped and rebuilt.
+    fts_exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'videos_fts'"
+    ).fetchone() is not None
+    rebuild_fts = fts_exists and version < 2
+    if rebuild_fts:
+        cursor.execute("DROP TABLE videos_fts")
+    
+    # Older databases stored JSON_FIELDS as plain text; quote those as JSON strings
+    for field in JSON_FIELDS:
+        cursor.execute(f"""
+            UPDATE videos SET {field} = json_quote({field})
+            WHERE {field} IS NOT NULL AND NOT json_valid({field})
+        """)
+    
+    cursor.execute(f"""
         CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5(
-            video_title,
-            summary_text,
-            key_topics,
-            recommendations,
-            action_items,
+            {_FTS_COLUMNS},
             content=videos,
-            content_rowid=id
+            content_rowid=id,
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    
+    if rebuild_fts:
+        cursor.execute(f"""
+            INSERT INTO videos_fts(rowid, {_FTS_COLUMNS})
+            SELECT id, {_fts_values('videos')} FROM videos
+        """)
+    
+    # Create triggers to keep FTS table in sync. Removing a row's terms needs the
+    # values it was indexed with, hence the 'delete' command with old.*
+    cursor.execute(f"""
+        CREATE TRIGGER videos_ai AFTER INSERT ON videos BEGIN
+            INSERT INTO videos_fts(rowid, {_FTS_COLUMNS})
+            VALUES (new.id, {_fts_values('new')});
+        END
+    """)
+    
+    cursor.execute(f"""
+        CREATE TRIGGER videos_ad AFTER DELETE ON videos BEGIN
+            INSERT INTO videos_fts(videos_fts, rowid, {_FTS_COLUMNS})
+            VALUES ('delete', old.id, {_fts_values('old')});
+        END
+    """)
+    
+    cursor.execute(f"""
+        CREATE TRIGGER videos_au AFTER UPDATE ON videos BEGIN
+            INSERT INTO videos_fts(videos_fts, rowid, {_FTS_COLUMNS})
+            VALUES ('delete', old.id, {_fts_values('old')});
+            INSERT INTO videos_fts(rowid, {_FTS_COLUMNS})
+            VALUES (new.id, {_fts_values('new')});
+        END
+    """)
+    
+    # Materialized aggregates for get_stats(), kept in sync by triggers so
+    # /stats and /channels never have to scan the videos table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS videos_stats (
+            channel_name TEXT PRIMARY KEY,
+            cnt INTEGER NOT NULL
+        )
+    """)
+    
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS videos_source_stats (
+            source_type TEXT PRIMARY KEY,
+            cnt INTEGER NOT NULL
         )
     """)
     
-    # Create triggers to keep FTS table in sync
     cursor.execute("""
-        CREATE TRIGGER IF NOT EXISTS videos_ai AFTER INSERT ON videos BEGIN
-            INSERT INTO videos_fts(rowid, video_title, summary_text, key_topics, recommendations, action_items)
-            VALUES (new.id, new.video_title, new.summary_text, new.key_topics, new.recommendations, new.action_items);
+        CREATE TABLE IF NOT EXISTS videos_meta (
+            total INTEGER NOT NULL,
+            min_date TEXT,
+            max_date TEXT
+        )
+    """)
+    
+    # Backfill the aggregates the first time they are created
+    cursor.execute("SELECT COUNT(*) FROM videos_meta")
+    if cursor.fetchone()[0] == 0:
+        cursor.execute("""
+            INSERT INTO videos_stats(channel_name, cnt)
+            SELECT channel_name, COUNT(*) FROM videos GROUP BY channel_name
+        """)
+        cursor.execute("""
+            INSERT INTO videos_source_stats(source_type, cnt)
+            SELECT source_type, COUNT(*) FROM videos GROUP BY source_type
+        """)
+        cursor.execute("""
+            INSERT INTO videos_meta(total, min_date, max_date)
+            SELECT COUNT(*), MIN(published_date), MAX(published_date) FROM videos
+        """)
+    
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS videos_stats_ai AFTER INSERT ON videos BEGIN
+            INSERT INTO videos_stats(channel_name, cnt) VALUES (new.channel_name, 1)
+                ON CONFLICT(channel_name) DO UPDATE SET cnt = cnt + 1;
+            INSERT INTO videos_source_stats(source_type, cnt) VALUES (new.source_type, 1)
+                ON CONFLICT(source_type) DO UPDATE SET cnt = cnt + 1;
+            UPDATE videos_meta SET
+                total = total + 1,
+                min_date = MIN(COALESCE(min_date, new.published_date), new.published_date),
+                max_date = MAX(COALESCE(max_date, new.published_date), new.published_date);
         END
     """)
     
     cursor.execute("""
-        CREATE TRIGGER IF NOT EXISTS videos_ad AFTER DELETE ON videos BEGIN
-            DELETE FROM videos_fts WHERE rowid = old.id;
+        CREATE TRIGGER IF NOT EXISTS videos_stats_ad AFTER DELETE ON videos BEGIN
+            UPDATE videos_stats SET cnt = cnt - 1 WHERE channel_name = old.channel_name;
+            DELETE FROM videos_stats WHERE channel_name = old.channel_name AND cnt <= 0;
+            UPDATE videos_source_stats SET cnt = cnt - 1 WHERE source_type = old.source_type;
+            DELETE FROM videos_source_stats WHERE source_type = old.source_type AND cnt <= 0;
+            UPDATE videos_meta SET
+                total = total - 1,
+                min_date = (SELECT MIN(published_date) FROM videos),
+                max_date = (SELECT MAX(published_date) FROM videos);
         END
     """)
     
     cursor.execute("""
-        CREATE TRIGGER IF NOT EXISTS videos_au AFTER UPDATE ON videos BEGIN
-            DELETE FROM videos_fts WHERE rowid = old.id;
-            INSERT INTO videos_fts(rowid, video_title, summary_text, key_topics, recommendations, action_items)
-            VALUES (new.id, new.video_title, new.summary_text, new.key_topics, new.recommendations, new.action_items);
+        CREATE TRIGGER IF NOT EXISTS videos_stats_au AFTER UPDATE OF channel_name, source_type, published_date ON videos BEGIN
+            UPDATE videos_stats SET cnt = cnt - 1 WHERE channel_name = old.channel_name;
+            DELETE FROM videos_stats WHERE channel_name = old.channel_name AND cnt <= 0;
+            INSERT INTO videos_stats(channel_name, cnt) VALUES (new.channel_name, 1)
+                ON CONFLICT(channel_name) DO UPDATE SET cnt = cnt + 1;
+            UPDATE videos_source_stats SET cnt = cnt - 1 WHERE source_type = old.source_type;
+            DELETE FROM videos_source_stats WHERE source_type = old.source_type AND cnt <= 0;
+            INSERT INTO videos_source_stats(source_type, cnt) VALUES (new.source_type, 1)
+                ON CONFLICT(source_type) DO UPDATE SET cnt = cnt + 1;
+            UPDATE videos_meta SET
+                min_date = (SELECT MIN(published_date) FROM videos),
+                max_date = (SELECT MAX(published_date) FROM videos);
         END
     """)
     
+    # Video IDs each monitor profile has already handled (summarized, or skipped
+    # for good), so a video is never processed twice
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS processed_videos (
+            profile TEXT NOT NULL,
+            video_id TEXT NOT NULL,
+            PRIMARY KEY (profile, video_id)
+        ) WITHOUT ROWID
+    """)
+    
+    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
     conn.commit()
     conn.close()
     
+    analyze_database()
+    
     print(f"✓ Database initialized at {DB_PATH}")
 
+def analyze_database():
+    """Refresh the query planner statistics (sqlite_stat1) for the videos table.
+    
+    Without them SQLite guesses row counts and can pick the wrong index for
+    searches combining MATCH, published_date and channel_name filters.
+    """
+    conn = _connect()
+    conn.execute("ANALYZE videos")
+    conn.commit()
+    conn.close()
+
+def optimize_database():
+    """Run PRAGMA optimize once a monitor run has written to the database.
+    
+    SQLite re-analyzes only the tables whose statistics the new rows made
+    stale (processed_videos, the FTS shadow tables), so it is cheap to run
+    after every ingest.
+    """
+    conn = _connect()
+    conn.execute("PRAGMA optimize")
+    conn.close()
+
+_INSERT_VIDEO_SQL = """
+    INSERT OR IGNORE INTO videos (
+        video_id, channel_name, video_title, video_url,
+        published_date, processed_date, source_type, summary_text,
+        key_topics, recommendations, action_items, duration_seconds,
+        transcript_text
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def _to_json(value):
+    """Encode an optional JSON_FIELDS value (str, list, dict...) as JSON text."""
+    return None if value is None else orjson.dumps(value).decode()
+
+def _video_params(video_data, processed_date):
+    """Map a video_data dict onto the positional parameters of _INSERT_VIDEO_SQL."""
+    return (
+        video_data['video_id'],
+        video_data['channel_name'],
+        video_data['video_title'],
+        video_data['video_url'],
+        video_data['published_date'],
+        processed_date,
+        video_data.get('source_type', 'youtube_captions'),
+        video_data['summary_text'],
+        _to_json(video_data.get('key_topics')),
+        _to_json(video_data.get('recommendations')),
+        _to_json(video_data.get('action_items')),
+        video_data.get('duration_seconds'),
+        video_data.get('transcript_text')
+    )
+
 def insert_video_summary(video_data):
     """
     Insert a video summary into the database.
@@ -114,10 +413,11 @@ def insert_video_summary(video_data):
             - published_date: ISO format date string
             - source_type: 'youtube_captions' or 'audio_transcription'
             - summary_text: Full summary text
-            - key_topics: Comma-separated topics (optional)
-            - recommendations: Recommendations text (optional)
-            - action_items: Action items text (optional)
+            - key_topics: Topics, as a string or list (optional, stored as JSON)
+            - recommendations: Recommendations text or list (optional, stored as JSON)
+            - action_items: Action items text or list (optional, stored as JSON)
             - duration_seconds: Video duration in seconds (optional)
+            - transcript_text: Transcript the summary was made from (optional)
     
     Returns:
         int: Row ID of inserted record, or None if failed
@@ -126,148 +426,320 @@ def insert_video_summary(video_data):
         conn = _connect()
         cursor = conn.cursor()
 
-        cursor.execute("""
-            INSERT INTO videos (
-                video_id, channel_name, video_title, video_url,
-                published_date, processed_date, source_type, summary_text,
-                key_topics, recommendations, action_items, duration_seconds
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            video_data['video_id'],
-            video_data['channel_name'],
-            video_data['video_title'],
-            video_data['video_url'],
-            video_data['published_date'],
-            datetime.now().isoformat(),
-            video_data.get('source_type', 'youtube_captions'),
-            video_data['summary_text'],
-            video_data.get('key_topics'),
-            video_data.get('recommendations'),
-            video_data.get('action_items'),
-            video_data.get('duration_seconds')
-        ))
+        cursor.execute(_INSERT_VIDEO_SQL, _video_params(video_data, datetime.now().isoformat()))
         
         conn.commit()
+        inserted = cursor.rowcount
         row_id = cursor.lastrowid
         conn.close()
         
-        return row_id
-        
-    except sqlite3.IntegrityError as e:
-        # Video already exists (duplicate video_id)
-        if "UNIQUE constraint failed" in str(e):
+        if not inserted:
+            # Video already exists (duplicate video_id)
             print(f"    ⚠️  Video {video_data['video_id']} already in database, skipping")
             return None
-        raise
+        return row_id
+        
     except Exception as e:
         print(f"    Error inserting into database: {e}")
         return None
 
-def get_video_by_id(video_id):
-    """Get a video summary by video ID."""
+def get_processed_videos(profile):
+    """Return the set of video IDs the given monitor profile has processed."""
     conn = _connect()
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    rows = conn.execute(
+        "SELECT video_id FROM processed_videos WHERE profile = ?", (profile,)
+    ).fetchall()
+    conn.close()
+    return {row[0] for row in rows}
+
+def mark_videos_processed(profile, video_ids):
+    """
+    Record video IDs as processed for a monitor profile, in one transaction.
     
-    cursor.execute("SELECT * FROM videos WHERE video_id = ?", (video_id,))
-    row = cursor.fetchone()
+    IDs already recorded are ignored.
+    
+    Args:
+        profile (str): Monitor profile name
+        video_ids (iterable[str]): YouTube video IDs
+    """
+    conn = _connect()
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO processed_videos (profile, video_id) VALUES (?, ?)",
+            [(profile, video_id) for video_id in video_ids]
+        )
     conn.close()
+
+def save_video_summary(profile, video_data):
+    """
+    Insert a video summary and mark the video processed, in one transaction.
+    
+    Either both are recorded or neither is, so a run that stops part-way never
+    leaves a video marked processed without its summary in the database.
     
+    Args:
+        profile (str): Monitor profile name
+        video_data (dict): Video information, as accepted by insert_video_summary
+    
+    Returns:
+        int: Row ID of inserted record, or None if it was a duplicate or failed
+    """
+    try:
+        conn = _connect()
+        with conn:
+            cursor = conn.execute(_INSERT_VIDEO_SQL,
+                                  _video_params(video_data, datetime.now().isoformat()))
+            conn.execute(
+                "INSERT OR IGNORE INTO processed_videos (profile, video_id) VALUES (?, ?)",
+                (profile, video_data['video_id'])
+            )
+        conn.close()
+        
+        if not cursor.rowcount:
+            print(f"    ⚠️  Video {video_data['video_id']} already in database, skipping")
+            return None
+        return cursor.lastrowid
+        
+    except Exception as e:
+        print(f"    Error inserting into database: {e}")
+        return None
+
+def get_video_by_id(video_id, conn=None):
+    """Get a video summary by video ID.
+
+    Pass an open connection (e.g. from reader()) to reuse it; otherwise one is
+    checked out of the read pool for the duration of the call.
+    """
+    if conn is None:
+        with reader() as conn:
+            return get_video_by_id(video_id, conn)
+
+    cursor = conn.execute("SELECT * FROM videos WHERE video_id = ?", (video_id,))
+    row = cursor.fetchone()
+
     return dict(row) if row else None
 
-def search_videos(search_term=None, from_date=None, channel=None, limit=10):
+# Bare words FTS5 treats as query operators
+_FTS_KEYWORDS = {'AND', 'OR', 'NOT', 'NEAR'}
+
+# bm25() weights, in videos_fts column order: a hit in the title counts five
+# times a hit in the summary, a hit in key_topics twice
+_BM25_RANK = "bm25(videos_fts, 5.0, 1.0, 2.0, 1.0, 1.0)"
+
+# search_videos() takes this many times `limit` best FTS matches (from the
+# requested channel, if any) before applying the date filter and recency
+# ordering
+FTS_CANDIDATE_FACTOR = 10
+
+def _sanitize_fts(search_term):
+    """Turn free-text user input into a safe FTS5 query.
+
+    Tickers and identifiers such as $TSLA, BRK.B or sap.m.Button contain
+    characters that raise 'fts5: syntax error'; any such token is wrapped in
+    double quotes (with embedded quotes doubled) and matched as a phrase.  A
+    bare AND/OR/NOT/NEAR is lowercased so it is searched for rather than parsed
+    as an operator.  Plain words become prefix queries ("semi" finds
+    "semiconductors").  Tokens are ANDed together.
+    """
+    tokens = []
+    for token in search_term.split():
+        if token in _FTS_KEYWORDS:
+            token = token.lower()
+        if token.replace('_', '').isalnum():
+            token += '*'
+        else:
+            token = '"' + token.replace('"', '""') + '"'
+        tokens.append(token)
+    return ' '.join(tokens)
+
+# Columns returned by search_videos(): everything the /ask and query_db
+# listings display, without processed_date/created_at
+_SEARCH_COLUMNS = (
+    'video_id', 'video_title', 'channel_name', 'video_url', 'published_date',
+    'duration_seconds', 'source_type', 'summary_text', 'key_topics',
+    'recommendations', 'action_items'
+)
+
+# Summary characters returned by search_videos(full=False)
+PREVIEW_CHARS = 300
+
+# Select lists for search_videos(full=True/False). The short form leaves out the
+# full summary and the topics/recommendations/action items, returning only a
+# summary_preview plus a summary_truncated flag.
+_SEARCH_SELECT = {
+    True: ", ".join("v." + c for c in _SEARCH_COLUMNS),
+    False: ", ".join("v." + c for c in _SEARCH_COLUMNS[:7]) +
+           f", substr(v.summary_text, 1, {PREVIEW_CHARS}) AS summary_preview"
+           f", length(v.summary_text) > {PREVIEW_CHARS} AS summary_truncated",
+}
+
+# search_videos() SQL, assembled once. Only the select list and the optional
+# filter clauses are filled in per call, so each combination is always the same
+# string and hits the connection's prepared-statement cache.
+_LIST_SQL = "SELECT {columns} FROM videos v WHERE 1=1"
+
+# Rank by relevance, nudged towards recent videos (bm25 is negative: lower is
+# better, so each day of age adds a small penalty)
+_FTS_SEARCH_SQL = f"""
+    WITH fts_matches AS (
+        SELECT rowid,
+               {_BM25_RANK} AS score,
+               snippet(videos_fts, 1, '<b>', '</b>', '…', 32) AS preview
+        FROM videos_fts
+        WHERE {{fts_where}}
+        ORDER BY score
+        LIMIT ?
+    )
+    SELECT {{columns}},
+           fm.score AS rank,
+           fm.preview
+    FROM fts_matches fm
+    JOIN videos v ON v.id = fm.rowid
+    WHERE 1=1{{filters}}
+    ORDER BY fm.score + (julianday('now') - julianday(v.published_date)) * 0.01
+    LIMIT ?
+"""
+
+# Rows pulled from the cursor per fetchmany() call in iter_videos()
+FETCH_BATCH = 64
+
+def search_videos(search_term=None, from_date=None, channel=None, limit=10, conn=None,
+                  substring=False, full=True):
     """
     Search videos with optional filters.
     
+    Takes the same arguments as iter_videos() and returns its rows as a list.
+    """
+    return list(iter_videos(search_term, from_date, channel, limit, conn, substring, full))
+
+def iter_videos(search_term=None, from_date=None, channel=None, limit=10, conn=None,
+                substring=False, full=True):
+    """
+    Search videos with optional filters, yielding rows as SQLite produces them.
+    
+    Rows are fetched FETCH_BATCH at a time, so callers that render as they go
+    hold at most one batch of summaries in memory.
+    
     Args:
         search_term: Text to search in title, summary, topics, etc.
         from_date: ISO date string to filter videos from this date onwards
-        channel: Filter by channel name
+        channel: Only videos from this channel (exact channel name)
         limit: Maximum number of results
+        conn: Open connection to reuse (defaults to one from the read pool)
+        substring: Match search_term as a raw substring with LIKE instead of
+            the full-text index (slower: scans every row)
+        full: Return the whole summary and the key_topics/recommendations/
+            action_items columns.  When False, rows carry only the first
+            PREVIEW_CHARS of the summary as summary_preview, and
+            summary_truncated says whether it was cut short.
     
-    Returns:
-        List of video dictionaries
+    Yields:
+        Video dictionaries
     """
-    conn = _connect()
-    conn.row_factory = sqlite3.Row
+    if conn is None:
+        with reader() as conn:
+            yield from iter_videos(search_term, from_date, channel, limit, conn, substring, full)
+        return
+
     cursor = conn.cursor()
 
-    if search_term:
-        # Use full-text search
-        query = """
-            SELECT v.* FROM videos v
-            JOIN videos_fts ON v.id = videos_fts.rowid
-            WHERE videos_fts MATCH ?
-        """
-        params = [search_term]
+    if search_term and search_term.strip() and not substring:
+        # Use full-text search; 'preview' is a highlighted excerpt of the summary.
+        # The MATCH runs on its own in a CTE so SQLite drives the query from the
+        # FTS index, then the date/channel filters and the recency nudge are
+        # applied to that candidate set (over-fetched so filtering still leaves
+        # `limit` rows in all but very skewed cases). The channel filter goes
+        # inside the CTE: a channel whose matches all rank below the global
+        # candidate cut would otherwise come back empty.
+        fts_where = "videos_fts MATCH ?"
+        fts_params = [_sanitize_fts(search_term)]
+        filters = ""
+        params = []
         
         if from_date:
-            query += " AND v.published_date >= ?"
+            # Every video in the window has id >= the smallest id in the window,
+            # so bounding the FTS rowid lets FTS5 skip older doclist entries
+            # instead of matching the whole index and filtering afterwards.
+            cursor.execute("SELECT MIN(id) FROM videos WHERE published_date >= ?", (from_date,))
+            min_id = cursor.fetchone()[0]
+            if min_id is None:
+                return
+            fts_where += " AND rowid >= ?"
+            fts_params.append(min_id)
+            filters += " AND v.published_date >= ?"
             params.append(from_date)
         
         if channel:
-            query += " AND v.channel_name LIKE ?"
-            params.append(f"%{channel}%")
+            fts_where += " AND rowid IN (SELECT id FROM videos WHERE channel_name = ?)"
+            fts_params.append(channel)
         
-        query += " ORDER BY v.published_date DESC LIMIT ?"
-        params.append(limit)
+        query = _FTS_SEARCH_SQL.format(columns=_SEARCH_SELECT[full], fts_where=fts_where,
+                                       filters=filters)
+        params = fts_params + [limit * FTS_CANDIDATE_FACTOR] + params + [limit]
         
     else:
-        # No search term, just filter
-        query = "SELECT * FROM videos WHERE 1=1"
+        # No search term (or a substring search), just filter
+        query = _LIST_SQL.format(columns=_SEARCH_SELECT[full])
         params = []
         
+        if search_term and search_term.strip():
+            query += " AND (video_title LIKE ? OR summary_text LIKE ? OR key_topics LIKE ?)"
+            params.extend([f"%{search_term.strip()}%"] * 3)
+        
         if from_date:
             query += " AND published_date >= ?"
             params.append(from_date)
         
         if channel:
-            query += " AND channel_name LIKE ?"
-            params.append(f"%{channel}%")
+            # Exact match so idx_channel_published (channel_name, published_date)
+            # can serve both the filter and the ordering (LIKE '%...%' scans)
+            query += " AND channel_name = ?"
+            params.append(channel)
         
         query += " ORDER BY published_date DESC LIMIT ?"
         params.append(limit)
     
+    # Plain tuples zipped with the column names once per query, rather than a
+    # sqlite3.Row per row that is then copied into a dict
+    cursor.row_factory = None
     cursor.execute(query, params)
-    rows = cursor.fetchall()
-    conn.close()
-    
-    return [dict(row) for row in rows]
+    fields = [column[0] for column in cursor.description]
+    while True:
+        rows = cursor.fetchmany(FETCH_BATCH)
+        if not rows:
+            break
+        for row in rows:
+            yield dict(zip(fields, row))
+
+def get_stats(conn=None):
+    """Get database statistics.
+
+    Reads the trigger-maintained videos_stats / videos_source_stats / videos_meta
+    tables, so the cost does not grow with the number of videos.
+    """
+    if conn is None:
+        with reader() as conn:
+            return get_stats(conn)
 
-def get_stats():
-    """Get database statistics."""
-    conn = _connect()
     cursor = conn.cursor()
     
     stats = {}
     
-    # Total videos
-    cursor.execute("SELECT COUNT(*) FROM videos")
-    stats['total_videos'] = cursor.fetchone()[0]
+    # Total videos and date range
+    cursor.execute("SELECT total, min_date, max_date FROM videos_meta")
+    total, min_date, max_date = cursor.fetchone()
+    stats['total_videos'] = total
     
     # Videos by channel
-    cursor.execute("""
-        SELECT channel_name, COUNT(*) as count
-        FROM videos
-        GROUP BY channel_name
-        ORDER BY count DESC
-    """)
-    stats['by_channel'] = dict(cursor.fetchall())
+    cursor.execute("SELECT channel_name, cnt FROM videos_stats ORDER BY cnt DESC")
+    stats['by_channel'] = {row[0]: row[1] for row in cursor.fetchall()}
     
     # Videos by source type
-    cursor.execute("""
-        SELECT source_type, COUNT(*) as count
-        FROM videos
-        GROUP BY source_type
-    """)
-    stats['by_source'] = dict(cursor.fetchall())
+    cursor.execute("SELECT source_type, cnt FROM videos_source_stats")
+    stats['by_source'] = {row[0]: row[1] for row in cursor.fetchall()}
     
-    # Date range
-    cursor.execute("SELECT MIN(published_date), MAX(published_date) FROM videos")
-    min_date, max_date = cursor.fetchone()
     stats['date_range'] = {'from': min_date, 'to': max_date}
     
-    conn.close()
     return stats
 
 if __name__ == "__main__":
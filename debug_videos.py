@@ -4,105 +4,123 @@ Debug script to investigate why specific videos aren't being picked up
 """
 
 import os
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 load_dotenv()
 
 from googleapiclient.discovery import build
 import re
 
+from youtube_monitor import resolve_channel_id
+
+# ISO 8601 duration as returned by the YouTube API (e.g., 'PT1H15M33S')
+_DURATION_RE = re.compile(r'^PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?$')
+
+# Title/description phrases that suggest members-only content (one pass per string)
+_MEMBER_RE = re.compile(r'members only|member exclusive|patreon|membership', re.IGNORECASE)
+
 def parse_duration(duration_str):
     """Parse ISO 8601 duration format (e.g., 'PT15M33S') to seconds."""
-    pattern = r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?'
-    match = re.match(pattern, duration_str)
+    match = _DURATION_RE.match(duration_str)
     
     if not match:
         return 0
     
-    hours = int(match.group(1)) if match.group(1) else 0
-    minutes = int(match.group(2)) if match.group(2) else 0
-    seconds = int(match.group(3)) if match.group(3) else 0
-    
-    return hours * 3600 + minutes * 60 + seconds
+    return sum(int(value or 0) * weight for value, weight in zip(match.groups(), (3600, 60, 1)))
 
-def debug_channel(handle):
-    """Debug what videos are being returned for a channel."""
+def fetch_channel(handle):
+    """Fetch the raw data debug_channel reports on, without printing anything.
+
+    Builds its own API client so several channels can be fetched from worker
+    threads at once (googleapiclient clients are not thread-safe).
+    """
     youtube_api_key = os.getenv('YOUTUBE_API_KEY')
     youtube = build('youtube', 'v3', developerKey=youtube_api_key)
+    report = {'handle': handle, 'channel_id': None, 'video_ids': [], 'videos': []}
     
-    print(f"\n{'='*80}")
-    print(f"Debugging channel: {handle}")
-    print(f"{'='*80}\n")
-    
-    # Get channel ID
-    handle_clean = handle.replace('@', '')
-    request = youtube.search().list(
-        part='snippet',
-        q=handle_clean,
-        type='channel',
-        maxResults=1
-    )
-    response = request.execute()
-    
-    if not response['items']:
-        print(f"❌ Channel not found!")
-        return
+    # Get channel ID (cached on disk after the first lookup)
+    report['channel_id'] = resolve_channel_id(youtube, handle)
     
-    channel_id = response['items'][0]['snippet']['channelId']
-    print(f"✓ Channel ID: {channel_id}\n")
+    if not report['channel_id']:
+        return report
     
     # Get videos from channel (raw search results)
-    print("Fetching last 15 videos from search API...")
     request = youtube.search().list(
         part='snippet',
-        channelId=channel_id,
+        channelId=report['channel_id'],
         type='video',
         order='date',
         maxResults=15
     )
     search_response = request.execute()
     
-    video_ids = [item['id']['videoId'] for item in search_response.get('items', [])]
-    print(f"✓ Found {len(video_ids)} videos in search results\n")
+    report['video_ids'] = [item['id']['videoId'] for item in search_response.get('items', [])]
     
-    if not video_ids:
-        print("❌ No videos found!")
-        return
+    if not report['video_ids']:
+        return report
     
     # Get detailed info for all videos
-    print("Fetching detailed video information...\n")
     video_details_request = youtube.videos().list(
         part='contentDetails,status,snippet',
-        id=','.join(video_ids)
+        id=','.join(report['video_ids'])
     )
     video_details = video_details_request.execute()
     
-    print(f"{'='*80}")
-    print(f"VIDEO DETAILS (showing all {len(video_details['items'])} videos)")
-    print(f"{'='*80}\n")
-    
-    for i, video in enumerate(video_details.get('items', []), 1):
-        video_id = video['id']
+    for video in video_details.get('items', []):
         title = video['snippet']['title']
-        published = video['snippet']['publishedAt']
-        duration_str = video['contentDetails']['duration']
-        duration_seconds = parse_duration(duration_str)
-        privacy_status = video['status'].get('privacyStatus', 'unknown')
         description = video['snippet'].get('description', '')
+        duration_str = video['contentDetails']['duration']
         
         # Check member-only indicators
-        title_lower = title.lower()
-        description_lower = description.lower()
-        member_indicators = ['members only', 'member exclusive', 'patreon', 'membership']
-        is_member_only = any(indicator in title_lower or indicator in description_lower for indicator in member_indicators)
+        is_member_only = bool(_MEMBER_RE.search(title) or _MEMBER_RE.search(description))
+        
+        report['videos'].append({
+            'id': video['id'],
+            'title': title,
+            'published': video['snippet']['publishedAt'],
+            'duration_str': duration_str,
+            'duration_seconds': parse_duration(duration_str),
+            'privacy_status': video['status'].get('privacyStatus', 'unknown'),
+            'is_member_only': is_member_only,
+        })
+    
+    return report
+
+def print_channel_report(report):
+    """Print what fetch_channel() found for one channel."""
+    print(f"\n{'='*80}")
+    print(f"Debugging channel: {report['handle']}")
+    print(f"{'='*80}\n")
+    
+    if not report['channel_id']:
+        print(f"❌ Channel not found!")
+        return
+    
+    print(f"✓ Channel ID: {report['channel_id']}\n")
+    print(f"✓ Found {len(report['video_ids'])} videos in search results\n")
+    
+    if not report['video_ids']:
+        print("❌ No videos found!")
+        return
+    
+    print(f"{'='*80}")
+    print(f"VIDEO DETAILS (showing all {len(report['videos'])} videos)")
+    print(f"{'='*80}\n")
+    
+    for i, video in enumerate(report['videos'], 1):
+        video_id = video['id']
+        duration_seconds = video['duration_seconds']
+        privacy_status = video['privacy_status']
         
         print(f"Video {i}:")
-        print(f"  Title: {title}")
+        print(f"  Title: {video['title']}")
         print(f"  Video ID: {video_id}")
         print(f"  URL: https://youtube.com/watch?v={video_id}")
-        print(f"  Published: {published}")
-        print(f"  Duration: {duration_seconds}s ({duration_str})")
+        print(f"  Published: {video['published']}")
+        print(f"  Duration: {duration_seconds}s ({video['duration_str']})")
         print(f"  Privacy: {privacy_status}")
-        print(f"  Member-only detected: {is_member_only}")
+        print(f"  Member-only detected: {video['is_member_only']}")
         
         # Show filtering decision
         print(f"\n  FILTERING DECISION:")
@@ -110,13 +128,17 @@ def debug_channel(handle):
             print(f"    ❌ FILTERED OUT - Too short (< 60s)")
         elif privacy_status != 'public':
             print(f"    ❌ FILTERED OUT - Not public ({privacy_status})")
-        elif is_member_only:
+        elif video['is_member_only']:
             print(f"    ❌ FILTERED OUT - Member-only content")
         else:
             print(f"    ✅ WOULD BE INCLUDED")
         
         print()
 
+def debug_channel(handle):
+    """Debug what videos are being returned for a channel."""
+    print_channel_report(fetch_channel(handle))
+
 def debug_specific_video(video_id):
     """Debug a specific video by ID."""
     youtube_api_key = os.getenv('YOUTUBE_API_KEY')
@@ -146,10 +168,7 @@ def debug_specific_video(video_id):
     channel_title = video['snippet']['channelTitle']
     
     # Check member-only indicators
-    title_lower = title.lower()
-    description_lower = description.lower()
-    member_indicators = ['members only', 'member exclusive', 'patreon', 'membership']
-    is_member_only = any(indicator in title_lower or indicator in description_lower for indicator in member_indicators)
+    is_member_only = bool(_MEMBER_RE.search(title) or _MEMBER_RE.search(description))
     
     print(f"Title: {title}")
     print(f"Channel: {channel_title}")
@@ -173,13 +192,29 @@ def debug_specific_video(video_id):
     print(f"{'='*80}\n")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Debug which videos the monitor would pick up')
+    parser.add_argument(
+        '--interactive',
+        action='store_true',
+        help='Check channels one at a time, pausing between them'
+    )
+    args = parser.parse_args()
+    
+    handles = ["@parkevtatevosiancfa9544", "@AkshatZayn", "@FinTek"]
+    
     # Debug the specific video mentioned
     print("\n🔍 DEBUGGING SPECIFIC VIDEO")
     debug_specific_video("xsoAkbIhM4w")
     
     # Debug all three channels
     print("\n\n🔍 DEBUGGING ALL CHANNELS")
-    for handle in ["@parkevtatevosiancfa9544", "@AkshatZayn", "@FinTek"]:
-        debug_channel(handle)
-        input("\nPress Enter to continue to next channel...")
+    if args.interactive:
+        for handle in handles:
+            debug_channel(handle)
+            input("\nPress Enter to continue to next channel...")
+    else:
+        # API calls are I/O-bound, so fetch every channel at once and print in order
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            for report in pool.map(fetch_channel, handles):
+                print_channel_report(report)
 
@@ -5,120 +5,144 @@ Query CLI for YouTube Research Database
 Search and retrieve video summaries from the SQLite database.
 """
 
-import argparse
 import sys
-from datetime import datetime
+from functools import wraps
 from pathlib import Path
 
-# Add current directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent))
+import orjson
 
-from db_manager import search_videos, get_stats, get_video_by_id, DB_PATH
+from db_manager import (search_videos, iter_videos, get_stats, get_video_by_id, get_conn,
+                        init_database, DB_PATH, PREVIEW_CHARS)
+
+# Top-level help as build_parser() renders it at 80 columns; test_query_db.py
+# fails when the two drift apart
+HELP_FILE = Path(__file__).with_name("query_db_help.txt")
+
+SEP_EQ = "=" * 80
+SEP_DASH = "-" * 80
+SEP_BOX = "─" * 80
+
+def _format_json_field(value):
+    """Render a JSON-encoded key_topics/recommendations/action_items column.
+
+    Plain text from a database that hasn't been migrated yet is shown as-is.
+    """
+    try:
+        value = orjson.loads(value)
+    except orjson.JSONDecodeError:
+        return value
+    if isinstance(value, list):
+        return "\n".join(f"  • {item}" for item in value)
+    return str(value)
+
+def requires_db(command):
+    """Make a command handler bail out with an error if there is no database yet.
+
+    An existing database is brought up to the current schema first (a single
+    PRAGMA read when it already is), since the queries rely on tables that
+    only init_database() creates.
+    """
+    @wraps(command)
+    def wrapper(args):
+        if not DB_PATH.exists():
+            print("❌ Database not found. Run youtube_monitor.py first to create it.")
+            return 1
+        init_database()
+        return command(args)
+    return wrapper
 
 def format_video(video, show_full=False):
     """Format a video record for display."""
-    output = []
-    output.append("=" * 80)
-    output.append(f"📺 {video['video_title']}")
-    output.append("=" * 80)
-    output.append(f"Channel: {video['channel_name']}")
-    output.append(f"Published: {video['published_date']}")
-    output.append(f"Duration: {video.get('duration_seconds', 0)}s")
-    output.append(f"Source: {video['source_type']}")
-    output.append(f"URL: {video['video_url']}")
-    output.append("")
+    title, channel, published, duration, source, url = (
+        video['video_title'], video['channel_name'], video['published_date'],
+        video.get('duration_seconds') or 0, video['source_type'], video['video_url']
+    )
+    output = [
+        SEP_EQ,
+        f"📺 {title}",
+        SEP_EQ,
+        f"Channel: {channel}",
+        f"Published: {published}",
+        f"Duration: {duration}s",
+        f"Source: {source}",
+        f"URL: {url}",
+        "",
+    ]
     
     if show_full:
         # Show full summary
-        output.append("SUMMARY:")
-        output.append("-" * 80)
-        output.append(video['summary_text'])
-        output.append("")
-        
-        if video.get('key_topics'):
-            output.append("KEY TOPICS:")
-            output.append(video['key_topics'])
-            output.append("")
+        output.extend(("SUMMARY:", SEP_DASH, video['summary_text'], ""))
         
-        if video.get('recommendations'):
-            output.append("RECOMMENDATIONS:")
-            output.append(video['recommendations'])
-            output.append("")
-        
-        if video.get('action_items'):
-            output.append("ACTION ITEMS:")
-            output.append(video['action_items'])
-            output.append("")
+        for field, heading in (('key_topics', "KEY TOPICS:"),
+                               ('recommendations', "RECOMMENDATIONS:"),
+                               ('action_items', "ACTION ITEMS:")):
+            value = video.get(field)
+            if value:
+                output.extend((heading, _format_json_field(value), ""))
     else:
-        # Show summary preview
-        summary_preview = video['summary_text'][:300] + "..." if len(video['summary_text']) > 300 else video['summary_text']
-        output.append("SUMMARY (preview):")
-        output.append(summary_preview)
-        output.append("")
-        output.append("💡 Use --full to see complete summary")
-        output.append("")
+        # Show summary preview; rows from search_videos(full=False) arrive pre-cut
+        if 'summary_preview' in video:
+            summary, truncated = video['summary_preview'], video['summary_truncated']
+        else:
+            summary = video['summary_text']
+            summary, truncated = summary[:PREVIEW_CHARS], len(summary) > PREVIEW_CHARS
+        preview = summary + ("..." if truncated else "")
+        output.extend(("SUMMARY (preview):", preview, "", "💡 Use --full to see complete summary", ""))
     
     return "\n".join(output)
 
+@requires_db
 def search_command(args):
     """Handle search command."""
-    if not DB_PATH.exists():
-        print("❌ Database not found. Run youtube_monitor.py first to create it.")
-        return 1
-    
-    results = search_videos(
+    results = iter_videos(
         search_term=args.query,
         from_date=args.from_date,
         channel=args.channel,
-        limit=args.limit
+        limit=args.limit,
+        conn=get_conn(),
+        substring=args.substring,
+        full=args.full
     )
     
-    if not results:
+    # Render each video as it comes off the cursor instead of loading them all
+    count = 0
+    for count, video in enumerate(results, 1):
+        sys.stdout.write(f"\n\n{SEP_BOX}\n\n" if count > 1 else "\n")
+        sys.stdout.write(format_video(video, show_full=args.full))
+    
+    if not count:
         print("📭 No videos found matching your criteria.")
         return 0
     
-    print(f"\n🔍 Found {len(results)} video(s):\n")
-    
-    for i, video in enumerate(results, 1):
-        print(format_video(video, show_full=args.full))
-        if i < len(results):
-            print("\n" + "─" * 80 + "\n")
-    
+    sys.stdout.write(f"\n\n🔍 Found {count} video(s)\n")
     return 0
 
+@requires_db
 def stats_command(args):
     """Handle stats command."""
-    if not DB_PATH.exists():
-        print("❌ Database not found. Run youtube_monitor.py first to create it.")
-        return 1
+    # get_stats() reads the trigger-maintained videos_stats/videos_meta tables,
+    # so this is a few single-page lookups however large the database grows
+    stats = get_stats(get_conn())
     
-    stats = get_stats()
-    
-    print("\n📊 DATABASE STATISTICS")
-    print("=" * 80)
-    print(f"\nTotal videos: {stats['total_videos']}")
+    lines = ["", "📊 DATABASE STATISTICS", SEP_EQ, "", f"Total videos: {stats['total_videos']}"]
     
     if stats['date_range']['from']:
-        print(f"Date range: {stats['date_range']['from']} to {stats['date_range']['to']}")
+        lines.append(f"Date range: {stats['date_range']['from']} to {stats['date_range']['to']}")
     
-    print("\nVideos by channel:")
-    for channel, count in stats['by_channel'].items():
-        print(f"  • {channel}: {count}")
+    lines.append("\nVideos by channel:")
+    lines.extend(f"  • {channel}: {count}" for channel, count in stats['by_channel'].items())
     
-    print("\nVideos by source:")
-    for source, count in stats['by_source'].items():
-        print(f"  • {source}: {count}")
+    lines.append("\nVideos by source:")
+    lines.extend(f"  • {source}: {count}" for source, count in stats['by_source'].items())
     
-    print()
+    lines.append("\n")
+    sys.stdout.write("\n".join(lines))
     return 0
 
+@requires_db
 def get_command(args):
     """Handle get command (get video by ID)."""
-    if not DB_PATH.exists():
-        print("❌ Database not found. Run youtube_monitor.py first to create it.")
-        return 1
-    
-    video = get_video_by_id(args.video_id)
+    video = get_video_by_id(args.video_id, get_conn())
     
     if not video:
         print(f"❌ Video with ID '{args.video_id}' not found.")
@@ -127,35 +151,39 @@ def get_command(args):
     print("\n" + format_video(video, show_full=True))
     return 0
 
+@requires_db
 def list_command(args):
     """Handle list command (show recent videos)."""
-    if not DB_PATH.exists():
-        print("❌ Database not found. Run youtube_monitor.py first to create it.")
-        return 1
-    
     results = search_videos(
         from_date=args.from_date,
         channel=args.channel,
-        limit=args.limit
+        limit=args.limit,
+        conn=get_conn(),
+        full=False
     )
     
     if not results:
         print("📭 No videos found.")
         return 0
     
-    print(f"\n📋 Recent videos ({len(results)}):\n")
-    
+    chunks = [f"\n📋 Recent videos ({len(results)}):\n\n"]
     for i, video in enumerate(results, 1):
-        print(f"{i}. [{video['published_date']}] {video['video_title']}")
-        print(f"   Channel: {video['channel_name']}")
-        print(f"   ID: {video['video_id']}")
-        print()
+        chunks.append(
+            f"{i}. [{video['published_date']}] {video['video_title']}\n"
+            f"   Channel: {video['channel_name']}\n"
+            f"   ID: {video['video_id']}\n\n"
+        )
+    chunks.append("💡 Use 'query_db.py get <video_id>' to see full summary\n")
     
-    print("💡 Use 'query_db.py get <video_id>' to see full summary")
+    sys.stdout.write("".join(chunks))
     return 0
 
-def main():
+def build_parser():
+    """Build the argparse parser for all subcommands."""
+    import argparse
+    
     parser = argparse.ArgumentParser(
+        prog="query_db.py",
         description="Query YouTube Research Database",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
@@ -172,6 +200,9 @@ Examples:
   # Show full summary
   python query_db.py search NVDA --full
   
+  # Match part of a word (e.g. inside tickers or URLs)
+  python query_db.py search "ai-" --substring
+  
   # Get specific video by ID
   python query_db.py get xsoAkbIhM4w
   
@@ -189,9 +220,11 @@ Examples:
     search_parser = subparsers.add_parser('search', help='Search videos')
     search_parser.add_argument('query', help='Search term (searches title, summary, topics, etc.)')
     search_parser.add_argument('--from', dest='from_date', help='Filter videos from this date (YYYY-MM-DD)')
-    search_parser.add_argument('--channel', help='Filter by channel name')
+    search_parser.add_argument('--channel', help='Filter by channel name (exact match)')
     search_parser.add_argument('--limit', type=int, default=10, help='Maximum results (default: 10)')
     search_parser.add_argument('--full', action='store_true', help='Show full summaries')
+    search_parser.add_argument('--substring', action='store_true',
+                               help='Match the term anywhere inside words (slower, skips the search index)')
     
     # Get command
     get_parser = subparsers.add_parser('get', help='Get video by ID')
@@ -200,12 +233,30 @@ Examples:
     # List command
     list_parser = subparsers.add_parser('list', help='List recent videos')
     list_parser.add_argument('--from', dest='from_date', help='Filter videos from this date (YYYY-MM-DD)')
-    list_parser.add_argument('--channel', help='Filter by channel name')
+    list_parser.add_argument('--channel', help='Filter by channel name (exact match)')
     list_parser.add_argument('--limit', type=int, default=20, help='Maximum results (default: 20)')
     
     # Stats command
     stats_parser = subparsers.add_parser('stats', help='Show database statistics')
     
+    return parser
+
+def main():
+    # Plain `query_db.py stats` (e.g. polled from a monitoring loop) needs no
+    # option parsing, so skip importing argparse and building the parser
+    if sys.argv[1:] == ['stats']:
+        return stats_command(None)
+    
+    # Bare `query_db.py` and -h/--help just print the pre-rendered help,
+    # without importing argparse or building the parser
+    if sys.argv[1:] in ([], ['-h'], ['--help']):
+        try:
+            sys.stdout.write(HELP_FILE.read_text(encoding='utf-8'))
+            return 1 if not sys.argv[1:] else 0
+        except OSError:
+            pass  # file missing: let argparse render it
+    
+    parser = build_parser()
     args = parser.parse_args()
     
     if not args.command:
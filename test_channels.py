@@ -4,11 +4,30 @@ Test script to verify the bug fix - checks if all 3 channels return videos
 """
 
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 load_dotenv()
 
 from youtube_monitor import YouTubeMonitor
 
+# (handle, display name) of the channels to check
+CHANNELS = (
+    ("@parkevtatevosiancfa9544", "Parkev Tatevosian"),
+    ("@AkshatZayn", "Akshat Zayn"),
+    ("@FinTek", "FinTek"),
+)
+
+SEPARATOR = "=" * 60
+# One video's block of the report, filled in with a single format call
+VIDEO_TEMPLATE = (
+    "  Video {idx}:\n"
+    "    Title: {title}\n"
+    "    Duration: {dur}s\n"
+    "    Published: {pub}\n"
+    "    ID: {vid}\n"
+)
+
 def test_channels():
     """Test that all 3 channels return videos."""
     print("🧪 Testing channel video retrieval...\n")
@@ -16,41 +35,41 @@ def test_channels():
     try:
         monitor = YouTubeMonitor()
         
-        channels = [
-            ("@parkevtatevosiancfa9544", "Parkev Tatevosian"),
-            ("@AkshatZayn", "Akshat Zayn"),
-            ("@FinTek", "FinTek")
-        ]
+        def fetch(handle):
+            # The monitor gives each worker thread its own YouTube API client
+            channel_id = monitor.get_channel_id(handle)
+            videos = monitor.get_latest_videos(channel_id, count=3) if channel_id else []
+            return channel_id, videos
         
-        for handle, name in channels:
-            print(f"{'='*60}")
-            print(f"Testing: {name} ({handle})")
-            print(f"{'='*60}")
+        # Query all channels at once, then report them in the original order
+        with ThreadPoolExecutor(max_workers=len(CHANNELS)) as executor:
+            results = list(executor.map(fetch, [handle for handle, _ in CHANNELS]))
+        
+        for (handle, name), (channel_id, videos) in zip(CHANNELS, results):
+            # One write per channel instead of a print per line
+            lines = [SEPARATOR, f"Testing: {name} ({handle})", SEPARATOR]
             
-            channel_id = monitor.get_channel_id(handle)
             if not channel_id:
-                print(f"❌ FAILED: Could not find channel ID\n")
-                continue
-            
-            print(f"✓ Channel ID: {channel_id}")
-            
-            videos = monitor.get_latest_videos(channel_id, count=3)
-            print(f"✓ Retrieved {len(videos)} videos\n")
-            
-            if len(videos) == 0:
-                print(f"⚠️  WARNING: No videos found for this channel\n")
+                lines.append("❌ FAILED: Could not find channel ID\n")
             else:
-                for i, video in enumerate(videos, 1):
-                    print(f"  Video {i}:")
-                    print(f"    Title: {video['title']}")
-                    print(f"    Duration: {video['duration_seconds']}s")
-                    print(f"    Published: {video['published']}")
-                    print(f"    ID: {video['id']}")
-                    print()
+                lines.append(f"✓ Channel ID: {channel_id}")
+                lines.append(f"✓ Retrieved {len(videos)} videos\n")
+                
+                if len(videos) == 0:
+                    lines.append("⚠️  WARNING: No videos found for this channel\n")
+                else:
+                    lines.extend(
+                        VIDEO_TEMPLATE.format(idx=i, title=video['title'],
+                                              dur=video['duration_seconds'],
+                                              pub=video['published'], vid=video['id'])
+                        for i, video in enumerate(videos, 1)
+                    )
+            
+            sys.stdout.write("\n".join(lines) + "\n")
         
-        print(f"{'='*60}")
+        print(SEPARATOR)
         print("✅ Test complete!")
-        print(f"{'='*60}")
+        print(SEPARATOR)
         
     except Exception as e:
         print(f"\n❌ Test failed with error: {e}")
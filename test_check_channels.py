@@ -10,14 +10,20 @@ Covers the fix where a video whose summary failed with a transient error
 
 ...so the next scheduled run retries it instead of permanently skipping it.
 
+Also covers a Gemini quota error part-way through a run: the summaries
+already generated must still be emailed, and the videos that never started
+must be left for the next run.
+
 Run with: python -m unittest test_check_channels.py -v
 No live API calls, no network access, no real credentials required.
 """
 
+import threading
+import time
 import unittest
 from unittest.mock import patch, MagicMock
 
-from youtube_monitor import YouTubeMonitor
+from youtube_monitor import QuotaExceededError, YouTubeMonitor
 
 
 def make_monitor(channels, videos_per_channel=2):
@@ -49,8 +55,14 @@ class TestCheckChannelsTransientErrorHandling(unittest.TestCase):
     def setUp(self):
         self.channels = [{"handle": "@testchannel", "url": "https://youtube.com/@testchannel"}]
         self.monitor = make_monitor(self.channels)
-
-    @patch("youtube_monitor.insert_video_summary")
+        analyze_patcher = patch("youtube_monitor.analyze_database")
+        self.mock_analyze = analyze_patcher.start()
+        self.addCleanup(analyze_patcher.stop)
+        optimize_patcher = patch("youtube_monitor.optimize_database")
+        self.mock_optimize = optimize_patcher.start()
+        self.addCleanup(optimize_patcher.stop)
+
+    @patch("youtube_monitor.save_video_summary")
     def test_failed_summary_excluded_from_email_and_not_persisted(self, mock_insert):
         """A video whose generate_summary() returns the error placeholder must be
         skipped entirely: not emailed, not marked processed, not saved to DB."""
@@ -61,7 +73,7 @@ class TestCheckChannelsTransientErrorHandling(unittest.TestCase):
         self.monitor.generate_summary = MagicMock(
             return_value="⚠️ Error generating summary: 503 UNAVAILABLE. Model overloaded."
         )
-        self.monitor._save_processed_videos = MagicMock()
+        self.monitor._mark_processed = MagicMock()
         self.monitor.save_to_file = MagicMock()
         self.monitor.send_email = MagicMock()
 
@@ -73,8 +85,9 @@ class TestCheckChannelsTransientErrorHandling(unittest.TestCase):
         self.assertNotIn("FAIL123", self.monitor.processed_videos)
         # Must NOT be persisted to the DB
         mock_insert.assert_not_called()
+        self.mock_optimize.assert_not_called()
 
-    @patch("youtube_monitor.insert_video_summary", return_value=1)
+    @patch("youtube_monitor.save_video_summary", return_value=1)
     def test_successful_summary_is_emailed_and_persisted(self, mock_insert):
         """A video that summarizes successfully should still be emailed, marked
         processed, and saved to the DB exactly as before this fix."""
@@ -83,7 +96,7 @@ class TestCheckChannelsTransientErrorHandling(unittest.TestCase):
         self.monitor.get_channel_id = MagicMock(return_value="UC_fake_channel_id")
         self.monitor.get_latest_videos = MagicMock(return_value=[good_video])
         self.monitor.generate_summary = MagicMock(return_value="This is a real summary.")
-        self.monitor._save_processed_videos = MagicMock()
+        self.monitor._mark_processed = MagicMock()
         self.monitor.save_to_file = MagicMock()
         self.monitor.send_email = MagicMock()
 
@@ -92,12 +105,15 @@ class TestCheckChannelsTransientErrorHandling(unittest.TestCase):
         self.monitor.send_email.assert_called_once()
         self.assertIn("GOOD456", self.monitor.processed_videos)
         mock_insert.assert_called_once()
+        # Planner statistics are refreshed once the run has written rows
+        self.mock_analyze.assert_called_once()
+        self.mock_optimize.assert_called_once()
         # Sanity-check the emailed digest actually contains the good video's summary
         _, args, kwargs = self.monitor.send_email.mock_calls[0]
         body = args[1] if len(args) > 1 else kwargs.get("body", "")
         self.assertIn("This is a real summary.", body)
 
-    @patch("youtube_monitor.insert_video_summary", return_value=1)
+    @patch("youtube_monitor.save_video_summary", return_value=1)
     def test_mixed_batch_only_failed_video_is_excluded(self, mock_insert):
         """With one failing and one succeeding video in the same run, only the
         successful one should reach the email/DB; the failed one is skipped."""
@@ -107,13 +123,13 @@ class TestCheckChannelsTransientErrorHandling(unittest.TestCase):
         self.monitor.get_channel_id = MagicMock(return_value="UC_fake_channel_id")
         self.monitor.get_latest_videos = MagicMock(return_value=[failed_video, good_video])
 
-        def fake_generate_summary(video):
+        def fake_generate_summary(video, transcript=None):
             if video["id"] == "FAIL789":
                 return "⚠️ Error generating summary: [Errno 54] Connection reset by peer"
             return "A working summary for the good video."
 
         self.monitor.generate_summary = MagicMock(side_effect=fake_generate_summary)
-        self.monitor._save_processed_videos = MagicMock()
+        self.monitor._mark_processed = MagicMock()
         self.monitor.save_to_file = MagicMock()
         self.monitor.send_email = MagicMock()
 
@@ -121,7 +137,9 @@ class TestCheckChannelsTransientErrorHandling(unittest.TestCase):
 
         self.assertNotIn("FAIL789", self.monitor.processed_videos)
         self.assertIn("GOOD789", self.monitor.processed_videos)
-        mock_insert.assert_called_once()  # only the good video was saved
+        mock_insert.assert_called_once()
+        saved_ids = [row["video_id"] for _, row in (c.args for c in mock_insert.call_args_list)]
+        self.assertEqual(saved_ids, ["GOOD789"])  # only the good video was saved
         self.monitor.send_email.assert_called_once()
 
         _, args, kwargs = self.monitor.send_email.mock_calls[0]
@@ -130,5 +148,64 @@ class TestCheckChannelsTransientErrorHandling(unittest.TestCase):
         self.assertNotIn("Connection reset by peer", body)
 
 
+class TestCheckChannelsQuotaMidRun(unittest.TestCase):
+    def setUp(self):
+        self.channels = [{"handle": "@testchannel", "url": "https://youtube.com/@testchannel"}]
+        self.monitor = make_monitor(self.channels, videos_per_channel=6)
+        self.monitor.profile_config["max_workers"] = 2
+        self.videos = [make_video(f"VID{i}", title=f"Video {i}") for i in range(6)]
+
+        self.monitor.get_channel_id = MagicMock(return_value="UC_fake_channel_id")
+        self.monitor.get_latest_videos = MagicMock(return_value=self.videos)
+        self.monitor._mark_processed = MagicMock()
+        self.monitor.save_to_file = MagicMock()
+        self.monitor.send_email = MagicMock()
+
+        for target in ("analyze_database", "optimize_database"):
+            patcher = patch(f"youtube_monitor.{target}")
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @patch("youtube_monitor.save_video_summary", return_value=1)
+    def test_summaries_before_quota_are_still_emailed(self, mock_insert):
+        """VID0 hits the quota while VID1 is still running on the other worker:
+        VID1's summary still goes out, and the videos still queued are dropped."""
+        quota_hit = threading.Event()
+
+        def fake_generate_summary(video, transcript=None):
+            if video["id"] == "VID0":
+                quota_hit.set()
+                raise QuotaExceededError("Gemini API quota exceeded")
+            quota_hit.wait(timeout=5)  # finish after the quota error is handled
+            time.sleep(0.2)
+            return f"Summary of {video['id']}."
+
+        self.monitor.generate_summary = MagicMock(side_effect=fake_generate_summary)
+
+        self.monitor.check_channels()
+
+        started = {c.args[0]["id"] for c in self.monitor.generate_summary.call_args_list}
+        self.assertLess(len(started), len(self.videos))
+        self.assertIn("VID1", started)
+        self.assertEqual(self.monitor.processed_videos, started - {"VID0"})
+        self.assertEqual(mock_insert.call_count, len(started) - 1)
+
+        self.monitor.send_email.assert_called_once()
+        subject, body = self.monitor.send_email.call_args.args[:2]
+        self.assertIn("Partial", subject)
+        self.assertIn("Summary of VID1.", body)
+
+    @patch("youtube_monitor.save_video_summary", return_value=1)
+    def test_quota_before_any_summary_is_raised(self, mock_insert):
+        self.monitor.generate_summary = MagicMock(
+            side_effect=QuotaExceededError("Gemini API quota exceeded"))
+
+        with self.assertRaises(QuotaExceededError):
+            self.monitor.check_channels()
+
+        mock_insert.assert_not_called()
+        self.monitor.send_email.assert_not_called()
+
+
 if __name__ == "__main__":
     unittest.main()
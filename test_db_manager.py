@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Unit tests for db_manager: the write paths, the full-text index and the
+stats tables its triggers maintain, and FTS query sanitizing.
+
+Run with: python -m unittest test_db_manager.py -v
+Uses a throwaway database in a temp directory; no network access required.
+"""
+
+import contextlib
+import io
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+import db_manager
+
+
+def make_row(video_id, channel="Channel A", published="2026-01-01T00:00:00Z", **extra):
+    row = {
+        "video_id": video_id,
+        "channel_name": channel,
+        "video_title": f"Video {video_id}",
+        "video_url": f"https://www.youtube.com/watch?v={video_id}",
+        "published_date": published,
+        "summary_text": f"Summary of {video_id}",
+    }
+    row.update(extra)
+    return row
+
+
+class DatabaseTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        original_path = db_manager.DB_PATH
+        db_manager.DB_PATH = Path(tmp.name) / "research.db"
+        self.addCleanup(setattr, db_manager, "DB_PATH", original_path)
+
+        # Pooled read connections point at whichever database was open first
+        self.addCleanup(self._drain_read_pool)
+        self._drain_read_pool()
+
+        self.quiet(db_manager.init_database)
+
+    @staticmethod
+    def _drain_read_pool():
+        while not db_manager._read_pool.empty():
+            db_manager._read_pool.get_nowait().close()
+
+    @staticmethod
+    def quiet(fn, *args):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn(*args)
+
+    def execute(self, sql, params=()):
+        conn = sqlite3.connect(db_manager.DB_PATH)
+        with conn:
+            conn.execute(sql, params)
+        conn.close()
+
+    def fts_hits(self, term):
+        """Rows the index itself matches, including any left behind for a deleted video."""
+        conn = sqlite3.connect(db_manager.DB_PATH)
+        count = conn.execute("SELECT COUNT(*) FROM videos_fts WHERE videos_fts MATCH ?",
+                             (term,)).fetchone()[0]
+        conn.close()
+        return count
+
+    def search_ids(self, term):
+        return [row["video_id"] for row in db_manager.search_videos(term)]
+
+
+class TestFullTextIndex(DatabaseTestCase):
+    def test_json_fields_are_indexed_as_decoded_text(self):
+        self.quiet(db_manager.insert_video_summary, make_row(
+            "vid1", key_topics=["nvidia earnings", "tsla"], action_items="line1\nsemiconductors"))
+
+        self.assertEqual(self.search_ids("semiconductors"), ["vid1"])
+        self.assertEqual(self.search_ids("semi"), ["vid1"])
+        self.assertEqual(self.search_ids("nvidia"), ["vid1"])
+
+    def test_update_and_delete_keep_index_in_sync(self):
+        self.quiet(db_manager.insert_video_summary, make_row("vid1", key_topics=["nvidia"]))
+
+        self.execute("UPDATE videos SET key_topics = json_array('amd') WHERE video_id = 'vid1'")
+        self.assertEqual(self.fts_hits("nvidia"), 0)
+        self.assertEqual(self.search_ids("amd"), ["vid1"])
+
+        self.execute("DELETE FROM videos WHERE video_id = 'vid1'")
+        self.assertEqual(self.fts_hits("amd"), 0)
+
+
+class TestSaveVideoSummary(DatabaseTestCase):
+    def stored_ids(self):
+        conn = sqlite3.connect(db_manager.DB_PATH)
+        ids = [row[0] for row in conn.execute("SELECT video_id FROM videos ORDER BY id")]
+        conn.close()
+        return ids
+
+    def save(self, row, profile="finance"):
+        return self.quiet(db_manager.save_video_summary, profile, row)
+
+    def test_saves_row_and_marks_video_processed(self):
+        row_id = self.save(make_row("vid1"))
+
+        self.assertIsNotNone(row_id)
+        self.assertEqual(self.stored_ids(), ["vid1"])
+        self.assertEqual(db_manager.get_processed_videos("finance"), {"vid1"})
+        self.assertEqual(db_manager.get_processed_videos("pm_ai"), set())
+
+    def test_duplicate_is_skipped_but_still_marked_for_the_profile(self):
+        self.save(make_row("vid1"), profile="finance")
+
+        self.assertIsNone(self.save(make_row("vid1"), profile="pm_ai"))
+        self.assertEqual(self.stored_ids(), ["vid1"])
+        self.assertEqual(db_manager.get_processed_videos("pm_ai"), {"vid1"})
+
+    def test_failed_insert_leaves_video_unprocessed(self):
+        row = make_row("vid1")
+        del row["summary_text"]
+
+        self.assertIsNone(self.save(row))
+        self.assertEqual(self.stored_ids(), [])
+        self.assertEqual(db_manager.get_processed_videos("finance"), set())
+
+    def test_json_fields_are_stored_as_json(self):
+        self.save(make_row("vid1", key_topics=["a", "b"], recommendations="plain"))
+
+        video = db_manager.get_video_by_id("vid1")
+        self.assertEqual(video["key_topics"], '["a","b"]')
+        self.assertEqual(video["recommendations"], '"plain"')
+        self.assertIsNone(video["action_items"])
+
+
+class TestSanitizeFts(unittest.TestCase):
+    def test_plain_words_become_prefix_queries(self):
+        self.assertEqual(db_manager._sanitize_fts("semi conductors"), "semi* conductors*")
+        self.assertEqual(db_manager._sanitize_fts("snake_case"), "snake_case*")
+
+    def test_tokens_with_punctuation_are_quoted(self):
+        self.assertEqual(db_manager._sanitize_fts("$TSLA"), '"$TSLA"')
+        self.assertEqual(db_manager._sanitize_fts("sap.m.Button"), '"sap.m.Button"')
+        self.assertEqual(db_manager._sanitize_fts('say "hi"'), 'say* """hi"""')
+
+    def test_operators_are_searched_for(self):
+        self.assertEqual(db_manager._sanitize_fts("AND NOT"), "and* not*")
+
+    def test_blank_input(self):
+        self.assertEqual(db_manager._sanitize_fts("   "), "")
+
+
+class TestSearchInput(DatabaseTestCase):
+    def test_awkward_queries_do_not_raise(self):
+        self.quiet(db_manager.insert_video_summary,
+                   make_row("vid1", summary_text='Bought $TSLA and BRK.B, said "hold"'))
+
+        for term in ("$TSLA", "BRK.B", "NOT", 'said "hold', "(", "*", "-"):
+            with self.subTest(term=term):
+                db_manager.search_videos(term)
+        self.assertEqual(self.search_ids("$TSLA"), ["vid1"])
+        self.assertEqual(self.search_ids("BRK.B"), ["vid1"])
+
+
+class TestChannelSearch(DatabaseTestCase):
+    def test_channel_matches_below_the_candidate_cut_are_found(self):
+        # Channel A's title hits outrank every match from channel B, and there
+        # are more of them than limit * FTS_CANDIDATE_FACTOR
+        for i in range(db_manager.FTS_CANDIDATE_FACTOR * 2 + 5):
+            self.quiet(db_manager.insert_video_summary, make_row(
+                f"a{i}", channel="A", video_title="nvidia nvidia", summary_text="nvidia"))
+        self.quiet(db_manager.insert_video_summary, make_row(
+            "b1", channel="B", summary_text="a passing mention of nvidia"))
+
+        results = db_manager.search_videos("nvidia", channel="B", limit=2)
+
+        self.assertEqual([row["video_id"] for row in results], ["b1"])
+
+
+class TestStatsTriggers(DatabaseTestCase):
+    def insert(self, *rows):
+        for row in rows:
+            self.quiet(db_manager.insert_video_summary, row)
+
+    def test_insert_updates_counts_and_date_range(self):
+        self.insert(
+            make_row("vid1", channel="A", published="2026-01-05"),
+            make_row("vid2", channel="A", published="2026-01-01", source_type="audio_transcription"),
+            make_row("vid3", channel="B", published="2026-01-09"),
+        )
+
+        stats = db_manager.get_stats()
+        self.assertEqual(stats["total_videos"], 3)
+        self.assertEqual(stats["by_channel"], {"A": 2, "B": 1})
+        self.assertEqual(stats["by_source"], {"youtube_captions": 2, "audio_transcription": 1})
+        self.assertEqual(stats["date_range"], {"from": "2026-01-01", "to": "2026-01-09"})
+
+    def test_delete_decrements_and_drops_empty_groups(self):
+        self.insert(
+            make_row("vid1", channel="A", published="2026-01-05"),
+            make_row("vid2", channel="B", published="2026-01-09"),
+        )
+
+        self.execute("DELETE FROM videos WHERE video_id = 'vid2'")
+
+        stats = db_manager.get_stats()
+        self.assertEqual(stats["total_videos"], 1)
+        self.assertEqual(stats["by_channel"], {"A": 1})
+        self.assertEqual(stats["date_range"], {"from": "2026-01-05", "to": "2026-01-05"})
+
+        self.execute("DELETE FROM videos")
+        stats = db_manager.get_stats()
+        self.assertEqual(stats["total_videos"], 0)
+        self.assertEqual(stats["by_channel"], {})
+        self.assertEqual(stats["by_source"], {})
+        self.assertEqual(stats["date_range"], {"from": None, "to": None})
+
+    def test_update_moves_counts(self):
+        self.insert(
+            make_row("vid1", channel="A", published="2026-01-05"),
+            make_row("vid2", channel="A", published="2026-01-09"),
+        )
+
+        self.execute("""UPDATE videos SET channel_name = 'B', source_type = 'audio_transcription',
+                        published_date = '2026-02-01' WHERE video_id = 'vid2'""")
+
+        stats = db_manager.get_stats()
+        self.assertEqual(stats["total_videos"], 2)
+        self.assertEqual(stats["by_channel"], {"A": 1, "B": 1})
+        self.assertEqual(stats["by_source"], {"youtube_captions": 1, "audio_transcription": 1})
+        self.assertEqual(stats["date_range"], {"from": "2026-01-05", "to": "2026-02-01"})
+
+
+if __name__ == "__main__":
+    unittest.main()
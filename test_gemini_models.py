@@ -4,12 +4,38 @@ Test script to find the correct Gemini model for audio support
 """
 
 import os
+import json
+import argparse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 load_dotenv()
 
 import google.generativeai as genai
 
-def test_models():
+# list_models() results per API key (first 8 chars), reused by later --list runs
+MODELS_CACHE_FILE = Path.home() / ".gemini_models_cache.json"
+
+MODEL_FIELDS = ('name', 'display_name', 'description', 'supported_generation_methods',
+                'input_token_limit', 'output_token_limit')
+
+def list_models(api_key, refresh=False):
+    """Return the available models' metadata as dicts, cached on disk per API key."""
+    try:
+        cache = json.loads(MODELS_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        cache = {}
+    
+    key = api_key[:8]
+    if refresh or key not in cache:
+        cache[key] = [
+            {field: getattr(model, field) for field in MODEL_FIELDS}
+            for model in genai.list_models()
+        ]
+        MODELS_CACHE_FILE.write_text(json.dumps(cache, indent=2, default=list))
+    return cache[key]
+
+def test_models(show_list=False, refresh=False):
     """Test which models are available and support audio."""
     api_key = os.getenv('GEMINI_API_KEY')
     if not api_key:
@@ -18,18 +44,19 @@ def test_models():
     
     genai.configure(api_key=api_key)
     
-    print("🔍 Listing all available Gemini models...\n")
-    print("="*80)
-    
-    for model in genai.list_models():
-        print(f"\nModel: {model.name}")
-        print(f"  Display Name: {model.display_name}")
-        print(f"  Description: {model.description}")
-        print(f"  Supported methods: {model.supported_generation_methods}")
-        print(f"  Input token limit: {model.input_token_limit}")
-        print(f"  Output token limit: {model.output_token_limit}")
-    
-    print("\n" + "="*80)
+    if show_list:
+        print("🔍 Listing all available Gemini models...\n")
+        print("="*80)
+        
+        for model in list_models(api_key, refresh):
+            print(f"\nModel: {model['name']}")
+            print(f"  Display Name: {model['display_name']}")
+            print(f"  Description: {model['description']}")
+            print(f"  Supported methods: {model['supported_generation_methods']}")
+            print(f"  Input token limit: {model['input_token_limit']}")
+            print(f"  Output token limit: {model['output_token_limit']}")
+        
+        print("\n" + "="*80)
     print("\n✅ Testing which models work for generateContent with audio...\n")
     
     # Test models that might work
@@ -42,14 +69,25 @@ def test_models():
         "models/gemini-1.5-flash-latest",
     ]
     
-    for model_name in test_models:
-        try:
-            model = genai.GenerativeModel(model_name)
-            # Try a simple text generation first
-            response = model.generate_content("Say 'test successful'")
-            print(f"✅ {model_name} - WORKS for text generation")
-        except Exception as e:
-            print(f"❌ {model_name} - FAILED: {str(e)[:100]}")
+    def try_model(model_name):
+        model = genai.GenerativeModel(model_name)
+        # Try a simple text generation first
+        return model.generate_content("Say 'test successful'")
+    
+    # Each call is one network round-trip, so send them all at once
+    with ThreadPoolExecutor(max_workers=len(test_models)) as executor:
+        futures = {executor.submit(try_model, name): name for name in test_models}
+        for future in as_completed(futures):
+            model_name = futures[future]
+            try:
+                future.result()
+                print(f"✅ {model_name} - WORKS for text generation")
+            except Exception as e:
+                print(f"❌ {model_name} - FAILED: {str(e)[:100]}")
 
 if __name__ == "__main__":
-    test_models()
+    parser = argparse.ArgumentParser(description="Check which Gemini models respond to generate_content")
+    parser.add_argument('--list', action='store_true', help='Also print every available model (cached after the first run)')
+    parser.add_argument('--refresh', action='store_true', help='With --list, re-fetch the model list instead of using the cache')
+    args = parser.parse_args()
+    test_models(show_list=args.list, refresh=args.refresh)
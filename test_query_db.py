@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the query_db CLI's pre-rendered help text.
+
+Run with: python -m unittest test_query_db.py -v
+No database or network access required.
+"""
+
+import contextlib
+import io
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+import query_db
+
+
+class TestHelpFile(unittest.TestCase):
+    @unittest.skipIf(sys.version_info < (3, 10), "argparse section titles differ before 3.10")
+    def test_help_file_matches_the_parser(self):
+        with patch.dict(os.environ, {"COLUMNS": "80"}):
+            rendered = query_db.build_parser().format_help()
+
+        self.assertEqual(
+            query_db.HELP_FILE.read_text(encoding="utf-8"), rendered,
+            "query_db_help.txt is stale; regenerate it with: COLUMNS=80 python -c "
+            "\"import query_db; query_db.HELP_FILE.write_text("
+            "query_db.build_parser().format_help(), encoding='utf-8')\"")
+
+    def run_main(self, *argv):
+        out = io.StringIO()
+        with patch.object(sys, "argv", ["query_db.py", *argv]), \
+                patch.object(query_db, "build_parser") as build_parser, \
+                contextlib.redirect_stdout(out):
+            code = query_db.main()
+        build_parser.assert_not_called()
+        return code, out.getvalue()
+
+    def test_bare_invocation_and_help_flags_skip_the_parser(self):
+        help_text = query_db.HELP_FILE.read_text(encoding="utf-8")
+
+        self.assertEqual(self.run_main(), (1, help_text))
+        self.assertEqual(self.run_main("-h"), (0, help_text))
+        self.assertEqual(self.run_main("--help"), (0, help_text))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression tests for db_manager.search_videos().
+
+Checks with EXPLAIN QUERY PLAN that, once ANALYZE has run, the statements
+search_videos() actually executes for the hot search and listing cases are
+driven by the FTS index or a videos index and never fall back to a full scan
+of the videos table.
+
+Run with: python -m unittest test_query_plans.py -v
+Uses a throwaway database in a temp directory; no network access required.
+"""
+
+import contextlib
+import io
+import re
+import tempfile
+import unittest
+from pathlib import Path
+
+import db_manager
+
+# A plan step that walks the whole videos table without any index
+FULL_SCAN_RE = re.compile(r'^SCAN (v|videos)$')
+# FTS5 plan step driven by the MATCH; the idxStr may also carry rowid
+# constraints (e.g. '=M5' when the channel's rowids are probed)
+FTS_MATCH_RE = re.compile(r'VIRTUAL TABLE INDEX \d+:\S*M')
+
+
+class TestSearchQueryPlans(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        original_path = db_manager.DB_PATH
+        db_manager.DB_PATH = Path(tmp.name) / "research.db"
+        self.addCleanup(setattr, db_manager, "DB_PATH", original_path)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            db_manager.init_database()
+            for i in range(200):
+                db_manager.save_video_summary("finance", {
+                    "video_id": f"vid{i}",
+                    "channel_name": f"Channel {i % 5}",
+                    "video_title": f"Video {i}",
+                    "video_url": f"https://www.youtube.com/watch?v=vid{i}",
+                    "published_date": f"2026-01-{i % 28 + 1:02d}T00:00:00Z",
+                    "summary_text": "nvidia earnings" if i % 2 else "tesla deliveries",
+                })
+            db_manager.analyze_database()
+
+        self.conn = db_manager._connect_readonly()
+        self.addCleanup(self.conn.close)
+
+    def plans(self, **search_args):
+        """EXPLAIN QUERY PLAN each statement search_videos() runs for these arguments.
+
+        The statements are captured as executed (parameters inlined), so the
+        plans are those of the SQL the function really sends.
+        """
+        statements = []
+        self.conn.set_trace_callback(statements.append)
+        try:
+            db_manager.search_videos(conn=self.conn, **search_args)
+        finally:
+            self.conn.set_trace_callback(None)
+        # FTS5 also reports its own internal statements (PRAGMAs, reads of the
+        # 'main'.'videos_fts_*' shadow tables); keep only search_videos()' queries
+        queries = [sql for sql in statements
+                   if sql.lstrip().startswith(("SELECT", "WITH")) and "'main'." not in sql]
+        self.assertTrue(queries)
+        return [[row[3] for row in self.conn.execute("EXPLAIN QUERY PLAN " + sql)]
+                for sql in queries]
+
+    def assert_no_full_scan(self, plans):
+        for steps in plans:
+            self.assertFalse([s for s in steps if FULL_SCAN_RE.match(s)], steps)
+
+    def test_fts_search_uses_match_index(self):
+        for full in (True, False):
+            for filters in ({}, {"from_date": "2026-01-10", "channel": "Channel 1"}):
+                plans = self.plans(search_term="nvidia", full=full, **filters)
+                search_steps = plans[-1]
+                self.assertTrue(any(FTS_MATCH_RE.search(s) for s in search_steps),
+                                search_steps)
+                self.assert_no_full_scan(plans)
+
+    def test_listing_filters_use_indexes(self):
+        cases = [
+            {"from_date": "2026-01-10", "channel": "Channel 1"},
+            {"from_date": "2026-01-10"},
+            {"channel": "Channel 1"},
+        ]
+        for filters in cases:
+            plans = self.plans(limit=20, full=False, **filters)
+            for steps in plans:
+                self.assertTrue(any("USING" in s and "INDEX" in s for s in steps), steps)
+            self.assert_no_full_scan(plans)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Unit tests for YouTubeMonitor helpers: batched-summary parsing, the uploads
+playlist early exit in get_latest_videos(), and the channel ID, transcript and
+LLM caches.
+
+Run with: python -m unittest test_youtube_monitor.py -v
+No live API calls, no network access, no real credentials required.
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+import youtube_monitor
+from youtube_monitor import YouTubeMonitor
+
+
+def make_monitor():
+    """Construct a YouTubeMonitor without running __init__ (no real API clients/creds)."""
+    monitor = YouTubeMonitor.__new__(YouTubeMonitor)
+    monitor.profile_name = "test_profile"
+    monitor.profile_config = {}
+    monitor.processed_videos = set()
+    monitor._transcripts = {}
+    monitor._summaries = {}
+    return monitor
+
+
+def make_video(video_id):
+    return {"id": video_id, "title": f"Video {video_id}", "channel": "Test Channel",
+            "published": "2026-05-12"}
+
+
+class TestSummarizeBatch(unittest.TestCase):
+    def setUp(self):
+        self.monitor = make_monitor()
+        self.monitor._summary_prompt = lambda video, transcript: transcript
+        self.videos = [make_video("abc-1"), make_video("def_2"), make_video("ghi3")]
+        for video in self.videos:
+            self.monitor._transcripts[video["id"]] = (f"transcript {video['id']}", "youtube_captions")
+
+    def summarize(self, answer):
+        self.monitor._cached_generate = MagicMock(return_value=answer)
+        return self.monitor.summarize_batch(self.videos)
+
+    def test_answer_is_split_on_marker_lines(self):
+        answer = (
+            "Sure, here you go.\n"
+            "===VIDEO_ID=abc-1===\nFirst summary.\n\n"
+            "===VIDEO_ID=def_2===   \nSecond summary,\nover two lines.\n"
+            "===VIDEO_ID=ghi3===\nThird summary.\n"
+        )
+        self.assertEqual(self.summarize(answer), {
+            "abc-1": "First summary.",
+            "def_2": "Second summary,\nover two lines.",
+            "ghi3": "Third summary.",
+        })
+
+    def test_missing_empty_and_unknown_sections_are_dropped(self):
+        answer = (
+            "===VIDEO_ID=abc-1===\nFirst summary, quoting ===VIDEO_ID=def_2=== inline.\n"
+            "===VIDEO_ID=ghi3===\n\n"
+            "===VIDEO_ID=zzz9===\nNot one of ours.\n"
+        )
+        self.assertEqual(self.summarize(answer), {
+            "abc-1": "First summary, quoting ===VIDEO_ID=def_2=== inline.",
+        })
+
+    def test_failed_request_returns_nothing(self):
+        self.monitor._cached_generate = MagicMock(side_effect=RuntimeError("boom"))
+        with patch("builtins.print"):
+            self.assertEqual(self.monitor.summarize_batch(self.videos), {})
+
+
+def playlist(*video_ids):
+    return {"items": [{"contentDetails": {"videoId": video_id}} for video_id in video_ids]}
+
+
+def video_details(*video_ids):
+    return {"items": [{
+        "id": video_id,
+        "contentDetails": {"duration": "PT10M"},
+        "status": {"privacyStatus": "public"},
+        "snippet": {"title": f"Video {video_id}", "publishedAt": "2026-05-12T00:00:00Z",
+                    "channelTitle": "Test Channel"},
+    } for video_id in video_ids]}
+
+
+class TestGetLatestVideos(unittest.TestCase):
+    def setUp(self):
+        self.monitor = make_monitor()
+        self.client = MagicMock()
+        self.monitor._youtube_client = MagicMock(return_value=self.client)
+
+    def get_latest(self, uploads, details, count=2):
+        self.client.playlistItems.return_value.list.return_value.execute.return_value = uploads
+        self.client.videos.return_value.list.return_value.execute.return_value = details
+        return self.monitor.get_latest_videos("UCchannel", count=count)
+
+    def test_nothing_new_skips_the_details_request(self):
+        self.monitor.processed_videos = {"v1", "v2"}
+
+        self.assertEqual(self.get_latest(playlist("v1", "v2", "v3"), video_details()), [])
+        self.client.videos.assert_not_called()
+
+    def test_only_new_videos_are_looked_up(self):
+        # Two processed videos fill count=2 on their own, so v4 is never needed
+        self.monitor.processed_videos = {"v2", "v3"}
+
+        videos = self.get_latest(playlist("v1", "v2", "v3", "v4"), video_details("v1"))
+
+        self.assertEqual([video["id"] for video in videos], ["v1"])
+        self.assertEqual(self.client.videos.return_value.list.call_args.kwargs["id"], "v1")
+
+    def test_processed_videos_count_towards_the_limit(self):
+        videos = self.get_latest(playlist("v1", "v2", "v3"), video_details("v1", "v2", "v3"))
+
+        self.assertEqual([video["id"] for video in videos], ["v1", "v2"])
+
+
+class CacheTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+
+
+class TestChannelIdCache(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        for patcher in (
+            patch.object(youtube_monitor, "CHANNEL_ID_CACHE_FILE", self.tmp / "channel_ids.json"),
+            patch.dict(youtube_monitor._channel_ids, clear=True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.youtube = MagicMock()
+        self.youtube.channels.return_value.list.return_value.execute.return_value = {
+            "items": [{"id": "UC123"}]}
+
+    def resolve(self):
+        return youtube_monitor.resolve_channel_id(self.youtube, "@handle")
+
+    def lookups(self):
+        return self.youtube.channels.return_value.list.call_count
+
+    def test_resolved_handle_is_reused_from_memory_and_disk(self):
+        self.assertEqual(self.resolve(), "UC123")
+        self.assertEqual(self.resolve(), "UC123")
+        youtube_monitor._channel_ids.clear()  # a new process: only the file is left
+        self.assertEqual(self.resolve(), "UC123")
+
+        self.assertEqual(self.lookups(), 1)
+
+    def test_expired_entries_are_re_resolved_in_a_running_process(self):
+        self.resolve()
+
+        with patch.object(youtube_monitor, "CHANNEL_ID_CACHE_TTL", timedelta(seconds=-1)):
+            self.resolve()
+
+        self.assertEqual(self.lookups(), 2)
+
+
+class TestTranscriptCache(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = patch.object(youtube_monitor, "TRANSCRIPT_CACHE_DIR", self.tmp / "transcripts")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_round_trip_keeps_the_method(self):
+        youtube_monitor._write_cached_transcript("v1", "caption text", "youtube_captions")
+        youtube_monitor._write_cached_transcript("v2", "audio text", "audio_transcription")
+
+        self.assertEqual(youtube_monitor._read_cached_transcript("v1"),
+                         ("caption text", "youtube_captions"))
+        self.assertEqual(youtube_monitor._read_cached_transcript("v2"),
+                         ("audio text", "audio_transcription"))
+        self.assertIsNone(youtube_monitor._read_cached_transcript("v3"))
+
+    def test_least_recently_used_are_evicted_past_the_cap(self):
+        cache_dir = youtube_monitor.TRANSCRIPT_CACHE_DIR
+        for age, video_id in enumerate(("v1", "v2", "v3")):
+            youtube_monitor._write_cached_transcript(video_id, "x" * 10, "youtube_captions")
+            stamp = 1_000_000 - age * 100  # v1 newest, v3 oldest
+            os.utime(cache_dir / f"{video_id}.txt", (stamp, stamp))
+        youtube_monitor._read_cached_transcript("v3")  # reading marks it as used
+
+        with patch.object(youtube_monitor, "TRANSCRIPT_CACHE_MAX_BYTES", 30):
+            youtube_monitor._write_cached_transcript("v4", "x" * 10, "youtube_captions")
+
+        self.assertEqual(sorted(path.name for path in cache_dir.iterdir()),
+                         ["v1.txt", "v3.txt", "v4.txt"])
+
+
+class TestLlmCache(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.monitor = make_monitor()
+        self.monitor._llm_cache_dir = self.tmp / ".llm_cache"
+        self.monitor._gemini_call_with_retry = MagicMock(return_value=MagicMock(text="answer"))
+
+    def test_same_prompt_is_answered_from_disk(self):
+        self.assertEqual(self.monitor._cached_generate("v1", "prompt"), "answer")
+        self.assertEqual(self.monitor._cached_generate("v1", "prompt"), "answer")
+
+        self.monitor._gemini_call_with_retry.assert_called_once()
+
+    def test_changed_key_or_prompt_is_a_miss(self):
+        self.monitor._cached_generate("v1", "prompt")
+        self.monitor._cached_generate("v1", "other prompt")
+        self.monitor._cached_generate("v2", "prompt")
+
+        self.assertEqual(self.monitor._gemini_call_with_retry.call_count, 3)
+
+    def test_least_recently_used_answers_are_evicted_past_the_cap(self):
+        cache_dir = self.monitor._llm_cache_dir
+        paths = {}
+        for age, prompt in enumerate(("p1", "p2", "p3")):
+            seen = set(cache_dir.glob("*.json"))
+            self.monitor._cached_generate("v1", prompt)
+            [paths[prompt]] = set(cache_dir.glob("*.json")) - seen
+            stamp = 1_000_000 - age * 100  # p1 newest, p3 oldest
+            os.utime(paths[prompt], (stamp, stamp))
+        self.monitor._cached_generate("v1", "p3")  # a hit marks it as used
+
+        entry_size = paths["p1"].stat().st_size
+        with patch.object(youtube_monitor, "LLM_CACHE_MAX_BYTES", entry_size * 3):
+            self.monitor._cached_generate("v1", "p4")
+
+        self.assertEqual([prompt for prompt, path in sorted(paths.items()) if path.exists()],
+                         ["p1", "p3"])
+        self.assertEqual(len(list(cache_dir.glob("*.json"))), 3)
+
+    def test_empty_answers_are_not_saved(self):
+        self.monitor._gemini_call_with_retry.return_value = MagicMock(text="")
+
+        self.assertEqual(self.monitor._cached_generate("v1", "prompt"), "")
+        self.assertFalse(self.monitor._llm_cache_dir.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,10 +5,15 @@ Monitors specified YouTube channels for new videos and sends daily email summari
 """
 
 import os
-import json
+import re
+import orjson
 import time
 import socket
+import threading
 import argparse
+import hashlib
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import yaml
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -16,15 +21,24 @@ from google import genai
 from google.genai import errors as genai_errors
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from youtube_transcript_api import YouTubeTranscriptApi
+from googleapiclient.model import JsonModel
+try:
+    # Raised by the old google-generativeai SDK; see _is_quota_error()
+    from google.api_core.exceptions import ResourceExhausted
+except ImportError:
+    ResourceExhausted = None
+from youtube_transcript_api import (
+    YouTubeTranscriptApi, NoTranscriptFound, TranscriptsDisabled,
+    NotTranslatable, TranslationLanguageNotAvailable, RequestBlocked, IpBlocked,
+)
 import yt_dlp
 import tempfile
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from email.message import EmailMessage
 
 # Database integration
-from db_manager import init_database, insert_video_summary
+from db_manager import (init_database, save_video_summary, analyze_database,
+                        optimize_database, get_processed_videos, mark_videos_processed)
 
 # Legacy CONFIG dict — superseded by profiles/ YAML files.
 # Kept for reference. Not used when --profile flag is provided.
@@ -60,8 +74,111 @@ CONFIG = {
     # All videos are included, even YouTube Shorts (under 60 seconds).
 }
 
-# Default processed videos file (overridden per-profile in __init__)
-PROCESSED_VIDEOS_FILE = Path.home() / ".youtube_monitor_processed.json"
+# Handle → channel ID cache, shared by all profiles. Channel IDs never change,
+# but a handle can be given up and claimed by another channel, so entries are
+# re-resolved after CHANNEL_ID_CACHE_TTL.
+CHANNEL_ID_CACHE_FILE = Path.home() / ".youtube_monitor_channel_ids.json"
+CHANNEL_ID_CACHE_TTL = timedelta(days=30)
+_channel_id_cache_lock = threading.Lock()
+# In-process memo in front of the file, holding the same timestamped entries so
+# a long-running process re-resolves handles after the TTL too
+_channel_ids = {}
+
+# ISO 8601 video duration as returned by videos.list (e.g. 'PT1H2M3S')
+_DURATION_RE = re.compile(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?')
+
+# Transcripts already fetched or transcribed, one text file per video
+# ({id}.txt from captions, {id}.audio.txt from audio transcription). Videos don't
+# change, so these never go stale; the oldest are evicted past the size cap.
+TRANSCRIPT_CACHE_DIR = Path.home() / ".youtube_monitor_transcripts"
+TRANSCRIPT_CACHE_MAX_BYTES = 1024 ** 3
+_TRANSCRIPT_CACHE_SUFFIXES = {
+    'youtube_captions': '.txt',
+    'audio_transcription': '.audio.txt',
+}
+
+# Size cap for each profile's saved Gemini answers (summaries/<profile>/.llm_cache);
+# least recently used answers are evicted past it
+LLM_CACHE_MAX_BYTES = 1024 ** 3
+
+# Caption annotations such as [Music] / [Applause] and runs of whitespace,
+# dropped from transcripts before they go into a prompt
+_CAPTION_ANNOTATION_RE = re.compile(r'\[[A-Za-z][A-Za-z -]{0,29}\]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Caption tracks to try, in order of preference: manual English, auto-generated
+# English, then whatever track comes first translated to English
+_CAPTION_FINDERS = (
+    lambda transcripts: transcripts.find_manually_created_transcript(['en']),
+    lambda transcripts: transcripts.find_generated_transcript(['en']),
+    lambda transcripts: next(iter(transcripts)).translate('en'),
+)
+_NO_CAPTION_ERRORS = (NoTranscriptFound, NotTranslatable,
+                      TranslationLanguageNotAvailable, StopIteration)
+
+# Partial response for videos.list: just the keys get_latest_videos() reads
+VIDEO_FIELDS = ('items(id,contentDetails/duration,status/privacyStatus,'
+                'snippet(title,publishedAt,channelTitle,description))')
+
+# Channels looked up at once by check_channels() (YouTube Data API calls only)
+CHANNEL_WORKERS = 8
+
+# Videos summarized at once by check_channels(). Each one is mostly waiting on
+# caption/audio downloads and Gemini; kept small because the Gemini free tier
+# allows only a few requests per minute (rate-limit hits are retried anyway).
+# A profile can override it with a max_workers key.
+VIDEO_WORKERS = 4
+
+# Fragments yt-dlp downloads at once for a single audio track; the videos
+# themselves are already downloaded in parallel by the check_channels() workers
+AUDIO_FRAGMENT_WORKERS = 4
+
+# yt-dlp format selector for the transcription fallback. Speech transcribes
+# just as well from a ~50-70 kbps stream as from the 128-160 kbps "best" one,
+# and it is a fraction of the bytes to download and upload to Gemini; fall
+# back to the smallest stream, then to anything.
+AUDIO_FORMAT = ('bestaudio[ext=m4a][abr<=72]/bestaudio[abr<=72]/'
+                'worstaudio[ext=m4a]/worstaudio/best')
+
+# Audio downloads allowed at once, however many video workers a profile runs,
+# so caption-less videos don't all compete for the same bandwidth
+AUDIO_DOWNLOADS = 4
+_audio_download_slots = threading.BoundedSemaphore(AUDIO_DOWNLOADS)
+
+# Where download_audio() puts audio files; yt-dlp creates it when missing
+AUDIO_TMP_DIR = Path(tempfile.gettempdir()) / "youtube_monitor_audio"
+
+# MIME types for the native audio containers yt-dlp hands back, so the Gemini
+# upload doesn't depend on the host's mimetypes database
+AUDIO_MIME_TYPES = {
+    '.m4a': 'audio/mp4',
+    '.mp4': 'audio/mp4',
+    '.webm': 'audio/webm',
+    '.opus': 'audio/ogg',
+    '.ogg': 'audio/ogg',
+    '.mp3': 'audio/mpeg',
+}
+
+# Videos summarized per Gemini request (profile key summary_batch_size). At 1
+# every video gets its own request; above that, videos with a transcript are
+# grouped into one prompt whose answer is split on SUMMARY_MARKER lines, and
+# any video missing from the answer falls back to its own request.
+SUMMARY_BATCH_SIZE = 1
+SUMMARY_BATCH_MAX_CHARS = 300000  # prompt text per batch, well inside the context window
+
+# Transcript tokens sent per summary (profile key max_transcript_tokens); longer
+# transcripts are cut. About 3 hours of speech, and low enough that a few
+# workers together stay under the free tier's tokens-per-minute limit. Tokens
+# are estimated from length (CHARS_PER_TOKEN for English text) instead of a
+# count_tokens round-trip per video.
+MAX_TRANSCRIPT_TOKENS = 50000
+CHARS_PER_TOKEN = 4
+SUMMARY_MARKER = '===VIDEO_ID={}==='
+_SUMMARY_MARKER_RE = re.compile(r'^===VIDEO_ID=([\w-]+)===[ \t]*$', re.MULTILINE)
+
+# Per-thread scratch state: get_transcript() records here how the transcript
+# of the video the current worker is processing was obtained
+_worker_state = threading.local()
 
 # Legacy SUMMARY_PROMPT — superseded by profile YAML's prompt field.
 SUMMARY_PROMPT = """Analyze this financial video and provide a summary for a Product Leader. Do not omit any actionable data.
@@ -127,12 +244,8 @@ def _is_quota_error(exc):
     if isinstance(exc, genai_errors.ClientError) and getattr(exc, 'code', None) == 429:
         return True
     # Old google-generativeai SDK: ResourceExhausted
-    try:
-        from google.api_core.exceptions import ResourceExhausted
-        if isinstance(exc, ResourceExhausted):
-            return True
-    except ImportError:
-        pass
+    if ResourceExhausted is not None and isinstance(exc, ResourceExhausted):
+        return True
     # Fallback: string match for daily-limit keywords only.
     # 'perday' catches quotaId: "GenerateRequestsPerDayPerProjectPerModel-FreeTier"
     msg = str(exc).lower()
@@ -163,6 +276,142 @@ def _is_transient_error(exc):
     return False
 
 
+class OrjsonModel(JsonModel):
+    """googleapiclient response model that parses bodies with orjson."""
+
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return super().deserialize(content)  # non-JSON body: keep stock handling
+        if self._data_wrapper and 'data' in body:
+            body = body['data']
+        return body
+
+
+def build_youtube_client(api_key):
+    """Build a YouTube Data API client whose responses are parsed with orjson."""
+    return build('youtube', 'v3', developerKey=api_key, model=OrjsonModel())
+
+
+def _load_channel_id_cache():
+    """Load the handle → channel ID cache, or an empty dict if it's missing/corrupt."""
+    try:
+        return orjson.loads(CHANNEL_ID_CACHE_FILE.read_bytes())
+    except (OSError, ValueError):
+        return {}
+
+
+def _fresh_channel_id(entry):
+    """Return the channel ID from a cache entry, or None if it has expired.
+
+    Entries are {"channel_id": ..., "resolved_at": ISO timestamp}; the bare ID
+    strings older versions wrote have no timestamp and count as expired.
+    """
+    if not isinstance(entry, dict):
+        return None
+    try:
+        resolved_at = datetime.fromisoformat(entry['resolved_at'])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if datetime.now() - resolved_at > CHANNEL_ID_CACHE_TTL:
+        return None
+    return entry.get('channel_id')
+
+
+def _read_cached_transcript(video_id):
+    """Return (transcript, method) from the on-disk cache, or None on a miss."""
+    for method, suffix in _TRANSCRIPT_CACHE_SUFFIXES.items():
+        path = TRANSCRIPT_CACHE_DIR / f"{video_id}{suffix}"
+        try:
+            transcript = path.read_text(encoding='utf-8')
+        except OSError:
+            continue
+        os.utime(path)  # mark as recently used for eviction
+        return transcript, method
+    return None
+
+
+def _write_cached_transcript(video_id, transcript, method):
+    """Store a transcript in the on-disk cache, evicting the oldest past the cap.
+
+    Written to a temp file and renamed into place, so a reader never sees a
+    partial transcript. Failures are logged; the cache is only an optimization.
+    """
+    try:
+        TRANSCRIPT_CACHE_DIR.mkdir(exist_ok=True)
+        path = TRANSCRIPT_CACHE_DIR / f"{video_id}{_TRANSCRIPT_CACHE_SUFFIXES[method]}"
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=TRANSCRIPT_CACHE_DIR,
+                                         suffix='.tmp', delete=False) as f:
+            f.write(transcript)
+        os.replace(f.name, path)
+        _evict_least_recently_used(TRANSCRIPT_CACHE_DIR, '.txt', TRANSCRIPT_CACHE_MAX_BYTES)
+    except OSError as e:
+        print(f"    ⚠️  Could not cache transcript: {e}")
+
+
+def _evict_least_recently_used(cache_dir, suffix, max_bytes):
+    """Delete the oldest files ending in suffix until the rest fit in max_bytes.
+
+    Cache readers touch a file's mtime on every hit, so this evicts the least
+    recently used entries.
+    """
+    entries = [entry for entry in os.scandir(cache_dir) if entry.name.endswith(suffix)]
+    total = sum(entry.stat().st_size for entry in entries)
+    for entry in sorted(entries, key=lambda entry: entry.stat().st_mtime):
+        if total <= max_bytes:
+            break
+        total -= entry.stat().st_size
+        os.unlink(entry.path)
+
+
+def resolve_channel_id(youtube, handle):
+    """Return the channel ID for a @handle, using the cache when possible.
+
+    Handles are looked up in memory first, then in the on-disk cache that
+    persists across runs; either answer is used for up to CHANNEL_ID_CACHE_TTL.  On a miss in both
+    the handle is resolved with channels.list(forHandle=...), which costs 1
+    quota unit instead of the 100 a search.list lookup costs, and the result is
+    written back to CHANNEL_ID_CACHE_FILE with a timestamp.  API errors
+    propagate to the caller.  Returns None if no channel has that handle.
+    """
+    channel_id = _fresh_channel_id(_channel_ids.get(handle))
+    if channel_id:
+        return channel_id
+
+    with _channel_id_cache_lock:
+        entry = _load_channel_id_cache().get(handle)
+    channel_id = _fresh_channel_id(entry)
+    if channel_id:
+        _channel_ids[handle] = entry
+        return channel_id
+
+    response = youtube.channels().list(
+        part='id',
+        forHandle=handle.lstrip('@'),
+        fields='items/id'
+    ).execute()
+    items = response.get('items') or []
+    if not items:
+        return None
+    channel_id = items[0]['id']
+
+    # Merge with whatever is on disk now (another profile may have written to it)
+    # and replace the file atomically.
+    entry = {
+        'channel_id': channel_id,
+        'resolved_at': datetime.now().isoformat(timespec='seconds'),
+    }
+    with _channel_id_cache_lock:
+        cache = _load_channel_id_cache()
+        cache[handle] = entry
+        tmp_path = CHANNEL_ID_CACHE_FILE.with_suffix('.tmp')
+        tmp_path.write_bytes(orjson.dumps(cache, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, CHANNEL_ID_CACHE_FILE)
+    _channel_ids[handle] = entry
+    return channel_id
+
+
 def load_profile(profile_name):
     """Load a profile YAML file from profiles/{name}.yaml.
 
@@ -204,12 +453,15 @@ class YouTubeMonitor:
         self.summary_prompt = profile_config['prompt']
         self.enable_reading_queue = profile_config.get('enable_reading_queue', False)
 
-        # Profile-specific processed videos tracking file
-        self.processed_videos_file = Path.home() / f".youtube_monitor_processed_{profile_name}.json"
+        # Processed videos are tracked in the database; the older per-profile
+        # JSON list is imported on first load
+        self._legacy_processed_file = Path.home() / f".youtube_monitor_processed_{profile_name}.json"
 
         # Profile-specific output directory
         self.output_dir = Path("summaries") / profile_name
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Saved Gemini answers, see _cached_generate()
+        self._llm_cache_dir = self.output_dir / ".llm_cache"
 
         # Load API keys from environment variables
         self.youtube_api_key = os.getenv('YOUTUBE_API_KEY')
@@ -228,46 +480,75 @@ class YouTubeMonitor:
         # unresponsive server from stalling the process indefinitely.
         socket.setdefaulttimeout(60.0)
 
-        self.youtube = build('youtube', 'v3', developerKey=self.youtube_api_key)
+        self.youtube = build_youtube_client(self.youtube_api_key)
+        self._youtube_thread = threading.current_thread()
 
-        # Configure Gemini via the new google-genai SDK (google.generativeai is deprecated)
-        self.client = genai.Client(api_key=self.gemini_api_key)
+        # Gemini client (new google-genai SDK; google.generativeai is deprecated),
+        # created on first use — see the client property
+        self._client = None
+        self._client_lock = threading.Lock()
         # gemini-2.5-flash-lite: 20 req/day free. gemini-2.0-flash has limit:0 on this key.
         self.model_name = 'gemini-2.5-flash-lite'
 
-        self.processed_videos = self._load_processed_videos()
-
         # Initialize database
         init_database()
+
+        self.processed_videos = self._load_processed_videos()
+        # Transcripts fetched / batched summaries generated during the current
+        # check_channels() run
+        self._transcripts = {}
+        self._summaries = {}
     
+    @property
+    def client(self):
+        """The Gemini client, created the first time a run actually needs it.
+
+        One client for the whole run: its connection pool is shared by every
+        worker thread, so calls after the first skip the TLS handshake. Checks
+        that find no new videos never build it.
+        """
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = genai.Client(api_key=self.gemini_api_key)
+        return self._client
+
     def _load_processed_videos(self):
         """Load the set of already processed video IDs."""
-        if self.processed_videos_file.exists():
-            with open(self.processed_videos_file, 'r') as f:
-                return set(json.load(f))
-        return set()
-
-    def _save_processed_videos(self):
-        """Save the set of processed video IDs."""
-        with open(self.processed_videos_file, 'w') as f:
-            json.dump(list(self.processed_videos), f)
-    
+        processed = get_processed_videos(self.profile_name)
+        if processed:
+            return processed
+
+        # First run on the database: carry over IDs from the older tracking file
+        if self._legacy_processed_file.exists():
+            processed = set(orjson.loads(self._legacy_processed_file.read_bytes()))
+        if processed:
+            mark_videos_processed(self.profile_name, processed)
+        return processed
+
+    def _mark_processed(self, video_id):
+        """Record one processed video ID in the database right away."""
+        mark_videos_processed(self.profile_name, [video_id])
+
+    def _youtube_client(self):
+        """Return a YouTube API client for the calling thread.
+
+        googleapiclient's httplib2 transport isn't thread-safe, so threads
+        other than the one that built self.youtube get their own client.
+        """
+        if threading.current_thread() is self._youtube_thread:
+            return self.youtube
+        client = getattr(_worker_state, 'youtube', None)
+        if client is None:
+            client = _worker_state.youtube = build_youtube_client(self.youtube_api_key)
+        return client
+
     def get_channel_id(self, handle):
-        """Get channel ID from handle, with retry on transient network errors."""
-        handle_clean = handle.replace('@', '')
+        """Get channel ID from handle (cached on disk), with retry on transient network errors."""
         max_retries = 3
         for attempt in range(max_retries + 1):
             try:
-                request = self.youtube.search().list(
-                    part='snippet',
-                    q=handle_clean,
-                    type='channel',
-                    maxResults=1
-                )
-                response = request.execute()
-                if response['items']:
-                    return response['items'][0]['snippet']['channelId']
-                return None
+                return resolve_channel_id(self._youtube_client(), handle)
             except Exception as e:
                 if _is_quota_error(e):
                     raise QuotaExceededError(f"YouTube API quota exceeded: {e}") from e
@@ -282,44 +563,71 @@ class YouTubeMonitor:
         return None
     
     def get_latest_videos(self, channel_id, count=3):
-        """Get the latest N videos from a channel, with retry on transient network errors."""
+        """Get the latest N videos from a channel, with retry on transient network errors.
+
+        Videos already in self.processed_videos still count towards the N but are
+        left out of the result, and their details are never fetched.
+        """
         max_retries = 3
         for attempt in range(max_retries + 1):
             try:
+                # Read the channel's uploads playlist (newest first) rather than
+                # search.list: 1 quota unit instead of 100. Its ID is the channel
+                # ID with the "UC" prefix swapped for "UU".
                 # Fetch more videos than needed to account for filtering
-                request = self.youtube.search().list(
-                    part='snippet',
-                    channelId=channel_id,
-                    type='video',
-                    order='date',
-                    maxResults=15  # Fetch extra to account for filtering
+                request = self._youtube_client().playlistItems().list(
+                    part='contentDetails',
+                    playlistId='UU' + channel_id[2:],
+                    maxResults=15,  # Fetch extra to account for filtering
+                    fields='items/contentDetails/videoId'
                 )
                 response = request.execute()
 
                 valid_videos = []
                 video_ids = []
+                new_ids = []
+                processed_seen = 0
 
-                # First pass: collect video IDs
+                # First pass: collect video IDs, newest first. Processed videos were
+                # public when processed, so once `count` of them have been seen
+                # nothing older can make the cut.
                 for item in response.get('items', []):
-                    video_ids.append(item['id']['videoId'])
+                    video_id = item['contentDetails']['videoId']
+                    video_ids.append(video_id)
+                    if video_id in self.processed_videos:
+                        processed_seen += 1
+                        if processed_seen >= count:
+                            break
+                    else:
+                        new_ids.append(video_id)
 
-                if not video_ids:
+                if not new_ids:
                     return []
 
-                # Get video details including duration
-                video_details_request = self.youtube.videos().list(
+                # Get video details including duration (new videos only)
+                video_details_request = self._youtube_client().videos().list(
                     part='contentDetails,status,snippet',
-                    id=','.join(video_ids)
+                    id=','.join(new_ids),
+                    # Only the keys used below; the server drops the rest
+                    fields=VIDEO_FIELDS
                 )
                 video_details = video_details_request.execute()
+                details = {video['id']: video for video in video_details.get('items', [])}
 
-                # Second pass: filter videos
-                for video in video_details.get('items', []):
+                # Second pass: filter videos in upload order
+                taken = 0
+                for video_id in video_ids:
                     # Skip if we already have enough videos
-                    if len(valid_videos) >= count:
+                    if taken >= count:
                         break
 
-                    video_id = video['id']
+                    if video_id in self.processed_videos:
+                        taken += 1
+                        continue
+
+                    video = details.get(video_id)
+                    if video is None:
+                        continue  # deleted, or hidden from the API
 
                     # Get duration in ISO 8601 format (e.g., "PT15M33S")
                     duration_str = video['contentDetails']['duration']
@@ -339,6 +647,7 @@ class YouTubeMonitor:
                     # At that point, we can skip it or mark it accordingly.
 
                     # Video passed all filters
+                    taken += 1
                     valid_videos.append({
                         'id': video_id,
                         'title': video['snippet']['title'],
@@ -360,58 +669,45 @@ class YouTubeMonitor:
                     time.sleep(wait)
                     continue
                 print(f"Error getting videos for channel {channel_id}: {e}")
-                import traceback
                 traceback.print_exc()
                 return []
         return []
     
     def _parse_duration(self, duration_str):
         """Parse ISO 8601 duration format (e.g., 'PT15M33S') to seconds."""
-        import re
-        
-        # Pattern to match hours, minutes, and seconds
-        pattern = r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?'
-        match = re.match(pattern, duration_str)
+        match = _DURATION_RE.match(duration_str)
         
         if not match:
             return 0
         
-        hours = int(match.group(1)) if match.group(1) else 0
-        minutes = int(match.group(2)) if match.group(2) else 0
-        seconds = int(match.group(3)) if match.group(3) else 0
+        hours, minutes, seconds = map(int, match.groups(default='0'))
         
         return hours * 3600 + minutes * 60 + seconds
     
     def download_audio(self, video_id):
         """Download audio from YouTube video to temporary file."""
         try:
-            # Create temporary directory for audio files
-            temp_dir = Path(tempfile.gettempdir()) / "youtube_monitor_audio"
-            temp_dir.mkdir(exist_ok=True)
-            
-            output_path = temp_dir / f"{video_id}.mp3"
-            
-            # Configure yt-dlp options
+            # Configure yt-dlp options. The native audio stream is kept as-is
+            # (M4A when offered, else Opus/WebM) — Gemini accepts it directly,
+            # so there is no ffmpeg re-encode to MP3.
             ydl_opts = {
-                'format': 'bestaudio/best',
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'mp3',
-                    'preferredquality': '192',
-                }],
-                'outtmpl': str(temp_dir / f"{video_id}.%(ext)s"),
+                'format': AUDIO_FORMAT,
+                'outtmpl': str(AUDIO_TMP_DIR / f"{video_id}.%(ext)s"),
                 'quiet': True,
                 'no_warnings': True,
                 # Prevent yt-dlp from hanging if the CDN stalls mid-download.
                 # socket_timeout caps each individual socket read/connect operation.
                 'socket_timeout': 30,
+                # Fetch DASH fragments of a single video in parallel
+                'concurrent_fragment_downloads': AUDIO_FRAGMENT_WORKERS,
             }
             
             url = f"https://www.youtube.com/watch?v={video_id}"
             
             print(f"    Downloading audio from video...")
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
+            with _audio_download_slots, yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                info = ydl.extract_info(url, download=True)
+                output_path = Path(ydl.prepare_filename(info))
             
             if output_path.exists():
                 print(f"    ✓ Audio downloaded: {output_path.stat().st_size / 1024 / 1024:.1f} MB")
@@ -465,13 +761,67 @@ class YouTubeMonitor:
                 raise
         raise last_exc  # should never reach here, but satisfies type checkers
 
+    def _in_background(self, fn, *args, **kwargs):
+        """Run a cleanup call (file deletes) without waiting for it.
+
+        During check_channels() the call goes to self._cleanup_pool, which is
+        drained before the run finishes; anywhere else it simply runs inline.
+        Failures are logged, never raised.
+        """
+        def run():
+            try:
+                fn(*args, **kwargs)
+            except Exception as e:
+                print(f"    ⚠️  Cleanup failed: {e}")
+
+        pool = getattr(self, '_cleanup_pool', None)
+        if pool:
+            pool.submit(run)
+        else:
+            run()
+
+    def _cached_generate(self, key, prompt):
+        """Return Gemini's answer to a text prompt, reusing a saved answer if any.
+
+        Answers are saved under self._llm_cache_dir, one JSON file (prompt +
+        response) per sha256 of key and prompt, so re-running a video with an
+        unchanged prompt — after a crash or while debugging with --once —
+        doesn't spend another request. The least recently used answers are
+        evicted past LLM_CACHE_MAX_BYTES. Errors propagate as from
+        _gemini_call_with_retry().
+        """
+        digest = hashlib.sha256(f"{key}\n{prompt}".encode()).hexdigest()
+        path = self._llm_cache_dir / f"{digest}.json"
+        try:
+            text = orjson.loads(path.read_bytes())['response']
+            os.utime(path)  # mark as recently used for eviction
+            return text
+        except (OSError, ValueError, KeyError):
+            pass
+
+        text = self._gemini_call_with_retry(prompt).text or ''
+        if text:
+            try:
+                self._llm_cache_dir.mkdir(exist_ok=True)
+                tmp_path = path.with_suffix(f'.{threading.get_ident()}.tmp')
+                tmp_path.write_bytes(orjson.dumps({'prompt': prompt, 'response': text}))
+                os.replace(tmp_path, path)
+                _evict_least_recently_used(self._llm_cache_dir, '.json', LLM_CACHE_MAX_BYTES)
+            except OSError as e:
+                print(f"    ⚠️  Could not cache Gemini response: {e}")
+        return text
+
     def transcribe_audio_with_gemini(self, audio_path):
         """Transcribe audio file using Gemini Flash."""
+        audio_file = None
         try:
             print(f"    Transcribing audio with Gemini Flash...")
             
             # Upload audio file to Gemini (new SDK: client.files.upload)
-            audio_file = self.client.files.upload(file=audio_path)
+            mime_type = AUDIO_MIME_TYPES.get(Path(audio_path).suffix.lower())
+            audio_file = self.client.files.upload(
+                file=audio_path, config={'mime_type': mime_type} if mime_type else None)
+            audio_file = self._wait_until_active(audio_file)
 
             # Create prompt for transcription
             prompt = """Please transcribe this audio completely and accurately.
@@ -479,12 +829,10 @@ class YouTubeMonitor:
 Provide the full transcript of everything said in the audio. Do not summarize - transcribe word-for-word.
 Return only the transcript text, nothing else."""
 
-            # Generate transcription (retries automatically on per-minute rate limits)
+            # Generate transcription (retries automatically on per-minute rate limits,
+            # reusing the uploaded file on every attempt)
             response = self._gemini_call_with_retry([prompt, audio_file])
             transcript = response.text
-
-            # Clean up uploaded file from Gemini (new SDK: client.files.delete)
-            self.client.files.delete(name=audio_file.name)
             
             print(f"    ✓ Transcription complete ({len(transcript)} characters)")
             return transcript
@@ -494,38 +842,94 @@ Return only the transcript text, nothing else."""
                 raise QuotaExceededError(f"Gemini API quota exceeded: {e}") from e
             print(f"    Error transcribing audio with Gemini: {e}")
             return None
+        finally:
+            # Clean up uploaded file from Gemini (new SDK: client.files.delete)
+            # whether or not transcription worked, off the critical path
+            if audio_file is not None:
+                self._in_background(self.client.files.delete, name=audio_file.name)
+
+    def _wait_until_active(self, uploaded_file, timeout=300):
+        """Wait for an uploaded Gemini file to leave the PROCESSING state.
+
+        Long audio can still be processing when the upload returns, and a
+        generate call made before it is ACTIVE fails and has to be retried.
+        """
+        deadline = time.monotonic() + timeout
+        while uploaded_file.state and uploaded_file.state.name == 'PROCESSING':
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Gemini file {uploaded_file.name} still processing after {timeout}s")
+            time.sleep(2)
+            uploaded_file = self.client.files.get(name=uploaded_file.name)
+        if uploaded_file.state and uploaded_file.state.name == 'FAILED':
+            raise RuntimeError(f"Gemini could not process file {uploaded_file.name}")
+        return uploaded_file
     
     def get_transcript(self, video_id):
+        """Get transcript for a video, fetching it at most once.
+
+        With skip_no_transcript enabled a video's transcript is needed twice
+        (the availability check, then generate_summary()); the second call is
+        served from self._transcripts instead of fetching the captions — or
+        downloading and transcribing the audio — all over again. Across runs
+        (e.g. retrying a failed summary) transcripts come from
+        TRANSCRIPT_CACHE_DIR.
+        """
+        cached = self._transcripts.get(video_id) or _read_cached_transcript(video_id)
+        if cached:
+            self._transcripts[video_id] = cached
+            transcript, _worker_state.transcript_method = cached
+            return transcript
+
+        transcript = self._fetch_transcript(video_id)
+        if transcript:
+            method = getattr(_worker_state, 'transcript_method', 'youtube_captions')
+            self._transcripts[video_id] = (transcript, method)
+            if transcript != "MEMBERS_ONLY":
+                _write_cached_transcript(video_id, transcript, method)
+        return transcript
+
+    def _fetch_captions(self, video_id):
+        """Fetch English YouTube captions for a video, or None if it has none.
+
+        Tries manual captions, then auto-generated ones, then the first track
+        translated to English; only "no such transcript" errors move on to the
+        next option. A temporary block (YouTube's bot check) or a transient
+        network error is retried with a backoff rather than falling through to
+        the slow audio path; an IP ban (IpBlocked, typical for cloud hosts)
+        won't lift within a run, so it goes straight to the audio fallback.
+        """
+        max_retries = 3
+        for attempt in range(max_retries + 1):
+            try:
+                transcript_list = YouTubeTranscriptApi().list(video_id)
+                for find in _CAPTION_FINDERS:
+                    try:
+                        return find(transcript_list).fetch()
+                    except _NO_CAPTION_ERRORS:
+                        continue
+                return None
+            except TranscriptsDisabled:
+                return None
+            except IpBlocked:
+                raise
+            except Exception as e:
+                retryable = isinstance(e, RequestBlocked) or _is_transient_error(e)
+                if not retryable or attempt == max_retries:
+                    raise
+                wait = 15 * (attempt + 1)  # 15s, 30s, 45s
+                print(f"    ⏳ Caption request failed ({type(e).__name__}) — waiting {wait}s "
+                      f"({attempt + 1}/{max_retries})...")
+                time.sleep(wait)
+
+    def _fetch_transcript(self, video_id):
         """Get transcript for a video, trying multiple methods including audio transcription."""
         # First, try to get YouTube captions
         try:
-            # Try to get transcript in multiple languages
-            api = YouTubeTranscriptApi()
-            transcript_list = api.list(video_id)
-            
-            # First try to find manually created transcripts
-            try:
-                transcript = transcript_list.find_manually_created_transcript(['en'])
-                transcript_data = transcript.fetch()
-            except:
-                # Fall back to auto-generated transcripts
-                try:
-                    transcript = transcript_list.find_generated_transcript(['en'])
-                    transcript_data = transcript.fetch()
-                except:
-                    # Try any available transcript and translate to English
-                    try:
-                        for transcript in transcript_list:
-                            transcript_data = transcript.translate('en').fetch()
-                            break
-                    except:
-                        # No captions available - will try audio fallback below
-                        transcript_data = None
-            
+            transcript_data = self._fetch_captions(video_id)
             if transcript_data:
                 transcript_text = ' '.join([entry.text for entry in transcript_data])
                 print(f"    ✓ Transcript retrieved from YouTube captions")
-                self._last_transcript_method = 'youtube_captions'
+                _worker_state.transcript_method = 'youtube_captions'
                 return transcript_text
             
         except Exception as e:
@@ -552,20 +956,133 @@ Return only the transcript text, nothing else."""
         transcript = self.transcribe_audio_with_gemini(audio_path)
         
         # Clean up audio file
-        try:
-            Path(audio_path).unlink()
-            print(f"    ✓ Cleaned up audio file")
-        except:
-            pass
+        self._in_background(Path(audio_path).unlink, missing_ok=True)
         
         if transcript:
-            self._last_transcript_method = 'audio_transcription'
+            _worker_state.transcript_method = 'audio_transcription'
         
         return transcript
     
-    def generate_summary(self, video):
-        """Generate AI summary for a video."""
-        transcript = self.get_transcript(video['id'])
+    def _normalize_transcript(self, text):
+        """Drop caption annotations and collapse whitespace to save prompt tokens."""
+        text = _CAPTION_ANNOTATION_RE.sub(' ', text)
+        return _WHITESPACE_RE.sub(' ', text).strip()
+
+    def _transcript_char_budget(self):
+        """Transcript characters allowed per summary, from the token budget."""
+        max_tokens = self.profile_config.get('max_transcript_tokens', MAX_TRANSCRIPT_TOKENS)
+        return max_tokens * CHARS_PER_TOKEN
+
+    def _summary_prompt(self, video, transcript):
+        """Fill the profile's prompt template for one video."""
+        # Normalize first so the truncation below keeps as much speech as possible
+        transcript = self._normalize_transcript(transcript)
+        max_chars = self._transcript_char_budget()
+        if len(transcript) > max_chars:
+            # Cut at a word boundary
+            transcript = transcript[:max_chars].rsplit(' ', 1)[0] + "... [transcript truncated]"
+
+        return self.summary_prompt.format(
+            title=video['title'],
+            channel=video['channel'],
+            published=video['published'],
+            transcript=transcript
+        )
+
+    def summarize_batch(self, videos):
+        """Summarize several videos with a single Gemini request.
+
+        Every video must already have a transcript in self._transcripts.
+        Returns {video_id: summary} for the videos whose section could be
+        found in the answer; the caller summarizes the rest one by one.
+        """
+        sections = [
+            f"{SUMMARY_MARKER.format(video['id'])}\n"
+            f"{self._summary_prompt(video, self._transcripts[video['id']][0])}"
+            for video in videos
+        ]
+        prompt = (
+            f"You will analyze {len(videos)} videos. Each one starts with a marker "
+            f"line like {SUMMARY_MARKER.format('abc123')} followed by its own "
+            f"instructions and transcript.\n"
+            f"Answer each one separately, in the same order. Start each answer with "
+            f"its video's marker line, exactly as given, on a line of its own, and "
+            f"write nothing before the first marker.\n\n"
+            + "\n\n".join(sections)
+        )
+
+        try:
+            answer = self._cached_generate(','.join(video['id'] for video in videos), prompt)
+        except Exception as e:
+            if _is_quota_error(e):
+                raise QuotaExceededError(f"Gemini API quota exceeded: {e}") from e
+            print(f"    Error generating batched summary: {e}")
+            return {}
+
+        # re.split with one group → [preamble, id1, text1, id2, text2, ...]
+        parts = _SUMMARY_MARKER_RE.split(answer)
+        wanted = {video['id'] for video in videos}
+        summaries = {}
+        for video_id, text in zip(parts[1::2], parts[2::2]):
+            text = text.strip()
+            if video_id in wanted and text:
+                summaries[video_id] = text
+        return summaries
+
+    def _batch_summaries(self, videos, executor):
+        """Pre-generate summaries for videos in groups of summary_batch_size.
+
+        Fetches the transcripts on the executor, then sends one Gemini request
+        per group. Results land in self._summaries, where generate_summary()
+        picks them up. Videos without a usable transcript are left alone.
+        """
+        batch_size = self.profile_config.get('summary_batch_size', SUMMARY_BATCH_SIZE)
+        try:
+            transcripts = list(executor.map(
+                lambda video: self.get_transcript(video['id']), videos))
+        except QuotaExceededError:
+            return  # the per-video calls will hit it too and stop the run
+        ready = [video for video, transcript in zip(videos, transcripts)
+                 if transcript and transcript != "MEMBERS_ONLY"]
+
+        batches, batch, batch_chars = [], [], 0
+        for video in ready:
+            chars = min(len(self._transcripts[video['id']][0]), self._transcript_char_budget())
+            if batch and (len(batch) == batch_size
+                          or batch_chars + chars > SUMMARY_BATCH_MAX_CHARS):
+                batches.append(batch)
+                batch, batch_chars = [], 0
+            batch.append(video)
+            batch_chars += chars
+        if batch:
+            batches.append(batch)
+
+        for batch in batches:
+            if len(batch) == 1:
+                continue  # nothing to amortize; generate_summary() handles it
+            print(f"  📦 Summarizing {len(batch)} videos in one request...")
+            try:
+                summaries = self.summarize_batch(batch)
+            except QuotaExceededError:
+                return  # the per-video calls will hit it too and stop the run
+            self._summaries.update(summaries)
+            if len(summaries) < len(batch):
+                print(f"    ⚠️  {len(batch) - len(summaries)} summary(ies) missing from "
+                      f"batched answer — falling back to one request each")
+
+    def generate_summary(self, video, transcript=None):
+        """Generate AI summary for a video.
+
+        Pass transcript when the caller already fetched it; otherwise it is
+        fetched here.
+        """
+        if transcript is None:
+            transcript = self.get_transcript(video['id'])
+
+        # Already produced by a batched request this run
+        summary = self._summaries.pop(video['id'], None)
+        if summary:
+            return summary
         
         # Check if video is members-only
         if transcript == "MEMBERS_ONLY":
@@ -598,8 +1115,7 @@ Note: This summary is based on limited information (title and description only)
 VIDEO URL: https://youtube.com/watch?v={video['id']}
 """
                 try:
-                    response = self._gemini_call_with_retry(prompt)
-                    summary = "⚠️ LIMITED INFO - Transcript not available, summary based on description only:\n\n" + response.text
+                    summary = "⚠️ LIMITED INFO - Transcript not available, summary based on description only:\n\n" + self._cached_generate(video['id'], prompt)
                     return summary
                 except Exception as e:
                     if _is_quota_error(e):
@@ -618,20 +1134,10 @@ URL: https://youtube.com/watch?v={video['id']}
 Recommendation: Watch the video directly to get the full analysis."""
         
         # Transcript is available - do full analysis
-        max_chars = 100000
-        if len(transcript) > max_chars:
-            transcript = transcript[:max_chars] + "... [transcript truncated]"
-        
-        prompt = self.summary_prompt.format(
-            title=video['title'],
-            channel=video['channel'],
-            published=video['published'],
-            transcript=transcript
-        )
+        prompt = self._summary_prompt(video, transcript)
         
         try:
-            response = self._gemini_call_with_retry(prompt)
-            summary = response.text
+            summary = self._cached_generate(video['id'], prompt)
             return summary
         except Exception as e:
             if _is_quota_error(e):
@@ -660,7 +1166,6 @@ Recommendation: Watch the video directly to get the full analysis."""
     
     def _md_to_html(self, text: str) -> str:
         """Convert the minimal markdown Gemini produces into safe HTML."""
-        import re
         # **bold**
         text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
         # *italic*
@@ -752,17 +1257,18 @@ Recommendation: Watch the video directly to get the full analysis."""
     def send_email(self, subject, body, html_body=None):
         """Send email report as multipart/alternative (HTML preferred, plain-text fallback)."""
         try:
-            msg = MIMEMultipart('alternative')
+            msg = EmailMessage()
             msg['Subject'] = subject
             msg['From'] = self.gmail_user
             msg['To'] = self.recipient_email
 
             # Plain-text part (fallback for clients that can't render HTML)
-            msg.attach(MIMEText(body, 'plain'))
+            msg.set_content(body)
 
-            # HTML part (shown by default in modern email clients)
+            # HTML part (shown by default in modern email clients); turns the
+            # message into multipart/alternative
             if html_body:
-                msg.attach(MIMEText(html_body, 'html'))
+                msg.add_alternative(html_body, subtype='html')
 
             with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
                 server.login(self.gmail_user, self.gmail_app_password)
@@ -775,135 +1281,254 @@ Recommendation: Watch the video directly to get the full analysis."""
             print(f"   Check your GMAIL_USER and GMAIL_APP_PASSWORD settings")
             return False
     
-    def check_channels(self):
+    def _warm_gemini_client(self):
+        """Open the Gemini client's HTTPS connection ahead of the first real call.
+
+        Submitted alongside the channel lookups as soon as the first new video
+        turns up, so the client is built and the TLS handshake is already done
+        by the time the first transcription or summary request goes out. The
+        lookup (models.get) is not a generate call and uses no generation
+        quota. Failures are ignored; the real call simply connects itself.
+        """
+        try:
+            self.client.models.get(model=self.model_name)
+        except Exception:
+            pass
+
+    def _discover_channel(self, handle):
+        """Resolve a channel and list its latest videos; runs on a worker thread.
+
+        Returns (channel_id, videos), with channel_id None when the handle
+        can't be resolved. QuotaExceededError propagates to the caller.
+        """
+        channel_id = self.get_channel_id(handle)
+        if not channel_id:
+            return None, []
+        videos_per_channel = self.profile_config.get('videos_per_channel', 2)
+        return channel_id, self.get_latest_videos(channel_id, count=videos_per_channel)
+
+    def _process_video(self, video):
+        """Summarize one video; runs on a check_channels() worker thread.
+
+        Any number can run at once. The only shared state it touches is the
+        per-run caches: it stores this video's entry in self._transcripts and
+        pops it from self._summaries. Each is a single-key dict operation
+        (atomic under the GIL) on a key no other worker uses, and
+        check_channels() only reads an entry once its worker has finished and
+        clears the caches after the pool has shut down. Returns a
+        (status, summary, transcript_method) tuple where status is one of
+        'ok', 'no_transcript', 'members_only' or 'failed'.  QuotaExceededError
+        propagates to the caller.
+        """
+        _worker_state.transcript_method = 'youtube_captions'
+
+        # Check if video has transcript (if skip_no_transcript is enabled);
+        # the one fetched for the check is handed on to generate_summary()
+        transcript = None
+        if self.profile_config.get('skip_no_transcript', False):
+            transcript = self.get_transcript(video['id'])
+            if not transcript:
+                return 'no_transcript', None, None
+
+        summary = self.generate_summary(video, transcript=transcript)
+
+        if summary == "SKIP_MEMBERS_ONLY":
+            return 'members_only', None, None
+
+        # If summary failed (Gemini 503 exhausted all retries), don't mark
+        # as processed, don't save to DB, and don't include it in the email —
+        # next run will retry it from scratch instead of mailing the error text.
+        if summary.startswith("⚠️ Error generating summary:"):  # noqa: RUF001
+            return 'failed', None, None
+
+        # Source type depends on how this worker got the transcript
+        return 'ok', summary, _worker_state.transcript_method
+
+    def _db_row(self, video, summary, transcript_method, transcript):
+        """Build the videos-table row for a summarized video."""
+        return {
+            'video_id': video['id'],
+            'channel_name': video['channel'],
+            'video_title': video['title'],
+            'video_url': f"https://youtube.com/watch?v={video['id']}",
+            'published_date': video['published'],
+            'source_type': transcript_method,
+            'summary_text': summary,
+            'duration_seconds': video.get('duration_seconds', 0),
+            'transcript_text': transcript,
+            'key_topics': None,
+            'recommendations': None,
+            'action_items': None
+        }
+
+    def check_channels(self, progress_callback=None):
         """Check all channels for new videos and generate report.
 
+        Channels are looked up concurrently and their new videos collected
+        first, then summarized concurrently on up to VIDEO_WORKERS threads
+        (profile key max_workers).
+
         Quota-safe: if the Gemini daily quota is exhausted mid-run, any summaries
         already generated are still emailed and saved rather than being discarded.
         A QuotaExceededError is only re-raised when zero summaries were produced.
+
+        progress_callback, if given, is called with keyword arguments
+        (channel=..., summaries=...) as each channel starts and each summary is
+        generated, so callers like the API can report live progress.
         """
         print(f"\n{'='*60}")
         print(f"YouTube Monitor Check - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"{'='*60}\n")
 
-        all_summaries = []
-        new_videos_found = False
+        new_videos = []
         quota_exhausted = False  # set True when we hit the daily API limit mid-run
-
-        for channel_config in self.channels:
-            if quota_exhausted:
-                break
-
-            handle = channel_config['handle']
-            print(f"Checking channel: {handle}")
-
-            # YouTube API quota failure → stop immediately
-            try:
-                channel_id = self.get_channel_id(handle)
-            except QuotaExceededError:
-                print(f"  🚫 YouTube API quota exhausted — stopping early\n")
-                quota_exhausted = True
-                break
-
-            if not channel_id:
-                print(f"  ⚠️ Could not find channel ID for {handle}")
-                continue
-
-            videos_per_channel = self.profile_config.get('videos_per_channel', 2)
-            try:
-                videos = self.get_latest_videos(channel_id, count=videos_per_channel)
-            except QuotaExceededError:
-                print(f"  🚫 YouTube API quota exhausted — stopping early\n")
-                quota_exhausted = True
-                break
-
-            print(f"  Found {len(videos)} valid video(s) (after filtering)\n")
-
-            for video in videos:
-                if video['id'] in self.processed_videos:
-                    print(f"  ⏭️  Already processed: {video['title']}")
-                    continue
-
-                new_videos_found = True
-                print(f"  🆕 New video: {video['title']}")
-                print(f"      Duration: {video['duration_seconds']}s")
-                print(f"  📝 Generating summary...")
-
-                # Check if video has transcript (if skip_no_transcript is enabled)
-                if self.profile_config.get('skip_no_transcript', False):
-                    transcript = self.get_transcript(video['id'])
-                    if not transcript:
-                        print(f"  ⏭️  Skipping (no transcript available)")
-                        self.processed_videos.add(video['id'])
-                        self._save_processed_videos()
-                        continue
-
-                # Gemini quota failure → stop generating, send what we have
+        saved_to_db = False
+
+        # Look every channel up at once: the YouTube API calls are independent
+        # and mostly round-trip latency. Results are handled in channel order.
+        print(f"Checking {len(self.channels)} channel(s)...\n")
+        workers = min(len(self.channels), CHANNEL_WORKERS) + 1  # + the Gemini warm-up
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            lookups = [executor.submit(self._discover_channel, channel_config['handle'])
+                       for channel_config in self.channels]
+
+            for channel_config, lookup in zip(self.channels, lookups):
+                handle = channel_config['handle']
+                print(f"Checking channel: {handle}")
+                if progress_callback:
+                    progress_callback(channel=handle, summaries=0)
+
+                # YouTube API quota failure → stop looking for more videos
                 try:
-                    summary = self.generate_summary(video)
+                    channel_id, videos = lookup.result()
                 except QuotaExceededError:
-                    print(f"  🚫 Gemini quota exhausted — stopping after "
-                          f"{len(all_summaries)} summary(ies)\n")
+                    print(f"  🚫 YouTube API quota exhausted — stopping early\n")
                     quota_exhausted = True
-                    break  # inner loop — outer loop checks quota_exhausted
-
-                # Skip if video is members-only
-                if summary == "SKIP_MEMBERS_ONLY":
-                    print(f"  ⏭️  Skipping members-only video\n")
-                    self.processed_videos.add(video['id'])
-                    self._save_processed_videos()
+                    # Drop the lookups that haven't started; the break means
+                    # no cancelled lookup's result() is ever asked for
+                    for pending in lookups:
+                        pending.cancel()
+                    break
+
+                if not channel_id:
+                    print(f"  ⚠️ Could not find channel ID for {handle}")
                     continue
 
-                # If summary failed (Gemini 503 exhausted all retries), don't mark
-                # as processed, don't save to DB, and don't include it in the email —
-                # next run will retry it from scratch instead of mailing the error text.
-                summary_failed = summary.startswith("⚠️ Error generating summary:")  # noqa: RUF001
-                if summary_failed:
-                    print(f"  ⚠️  Summary failed (transient error) — will retry next run\n")
-                    continue
+                print(f"  Found {len(videos)} valid video(s) (after filtering)\n")
+
+                for video in videos:
+                    if video['id'] in self.processed_videos:
+                        print(f"  ⏭️  Already processed: {video['title']}")
+                        continue
 
-                # Determine source type based on how we got the transcript
-                transcript_method = getattr(self, '_last_transcript_method', 'youtube_captions')
-
-                all_summaries.append({
-                    'title': video['title'],
-                    'channel': video['channel'],
-                    'published': video['published'],
-                    'duration_seconds': video.get('duration_seconds', 0),
-                    'url': f"https://youtube.com/watch?v={video['id']}",
-                    'summary': summary,
-                })
-
-                self.processed_videos.add(video['id'])
-                # Checkpoint immediately — if the run is killed or times out
-                # after this point, the next run won't re-summarize this video
-                # or send a duplicate email for it.
-                self._save_processed_videos()
-
-                # Save to database
-                db_data = {
-                    'video_id': video['id'],
-                    'channel_name': video['channel'],
-                    'video_title': video['title'],
-                    'video_url': f"https://youtube.com/watch?v={video['id']}",
-                    'published_date': video['published'],
-                    'source_type': transcript_method,
-                    'summary_text': summary,
-                    'duration_seconds': video.get('duration_seconds', 0),
-                    'key_topics': None,
-                    'recommendations': None,
-                    'action_items': None
-                }
-
-                row_id = insert_video_summary(db_data)
-                if row_id:
-                    print(f"  💾 Saved to database (ID: {row_id})")
-
-                print(f"  ✓ Summary generated\n")
-
-        # Always persist the videos we successfully processed, even if we stopped early
-        self._save_processed_videos()
+                    print(f"  🆕 New video: {video['title']}")
+                    print(f"      Duration: {video['duration_seconds']}s")
+                    if not new_videos:
+                        # Gemini will be needed: connect while the other lookups finish
+                        executor.submit(self._warm_gemini_client)
+                    new_videos.append(video)
+
+        new_videos_found = bool(new_videos)
+        self._transcripts = {}
+        self._summaries = {}
+        # Results by position in new_videos, so the digest keeps channel order
+        # no matter which worker finishes first
+        results = [None] * len(new_videos)
+        completed = 0
+
+        if new_videos:
+            workers = self.profile_config.get('max_workers', VIDEO_WORKERS)
+            print(f"\n📝 Generating {len(new_videos)} summary(ies) "
+                  f"({min(workers, len(new_videos))} at a time)...\n")
+
+            # Only this thread touches processed_videos / results; workers just
+            # return their outcome. Audio / Gemini file deletes queue up on the
+            # cleanup pool and are waited for once every summary is done.
+            self._cleanup_pool = ThreadPoolExecutor(max_workers=2)
+            try:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    if self.profile_config.get('summary_batch_size', SUMMARY_BATCH_SIZE) > 1:
+                        self._batch_summaries(new_videos, executor)
+
+                    futures = {executor.submit(self._process_video, video): i
+                               for i, video in enumerate(new_videos)}
+                    for future in as_completed(futures):
+                        if future.cancelled():
+                            # Never started: dropped after the quota ran out,
+                            # and result() would raise CancelledError
+                            continue
+                        video = new_videos[futures[future]]
+                        try:
+                            status, summary, transcript_method = future.result()
+                        except QuotaExceededError:
+                            # Gemini quota failure → stop generating, send what we have
+                            if not quota_exhausted:
+                                print(f"  🚫 Gemini quota exhausted — stopping after "
+                                      f"{completed} summary(ies)\n")
+                                quota_exhausted = True
+                            for pending in futures:
+                                pending.cancel()
+                            continue
+
+                        if status == 'no_transcript':
+                            print(f"  ⏭️  Skipping (no transcript available): {video['title']}")
+                            self.processed_videos.add(video['id'])
+                            self._mark_processed(video['id'])
+                            continue
+
+                        if status == 'members_only':
+                            print(f"  ⏭️  Skipping members-only video: {video['title']}\n")
+                            self.processed_videos.add(video['id'])
+                            self._mark_processed(video['id'])
+                            continue
+
+                        if status == 'failed':
+                            print(f"  ⚠️  Summary failed (transient error) — will retry next run: "
+                                  f"{video['title']}\n")
+                            continue
+
+                        results[futures[future]] = (summary, transcript_method)
+                        completed += 1
+                        if progress_callback:
+                            progress_callback(channel=video['channel'], summaries=completed)
 
+                        self.processed_videos.add(video['id'])
+                        # Save the summary and the processed mark together, right
+                        # away — if the run is killed or times out after this
+                        # point, the summary is already in the database and the
+                        # next run won't re-summarize the video. (The transcript
+                        # is still in this run's cache here.)
+                        transcript = self._transcripts.get(video['id'], (None,))[0]
+                        row_id = save_video_summary(
+                            self.profile_name,
+                            self._db_row(video, summary, transcript_method, transcript))
+                        if row_id:
+                            saved_to_db = True
+                            print(f"  💾 Saved to database (ID: {row_id})")
+
+                        print(f"  ✓ Summary generated: {video['title']}\n")
+            finally:
+                self._cleanup_pool.shutdown(wait=True)
+                self._cleanup_pool = None
+
+            self._transcripts.clear()
+            self._summaries.clear()
+
+        all_summaries = []
+        for video, result in zip(new_videos, results):
+            if result is None:
+                continue
+            summary, transcript_method = result
+            all_summaries.append({
+                'title': video['title'],
+                'channel': video['channel'],
+                'published': video['published'],
+                'duration_seconds': video.get('duration_seconds', 0),
+                'url': f"https://youtube.com/watch?v={video['id']}",
+                'summary': summary,
+            })
+
+        email_thread = None
         if new_videos_found and all_summaries:
             timestamp = datetime.now().strftime('%Y-%m-%d')
             filename = f"daily_summary_{timestamp}.txt"
@@ -940,7 +1565,11 @@ Recommendation: Watch the video directly to get the full analysis."""
                 f"{subject_suffix}"
             )
             html_body = self._build_html_email(all_summaries, quota_exhausted)
-            self.send_email(subject, content, html_body)
+            # The SMTP handshake and send run while the planner statistics are
+            # refreshed below
+            email_thread = threading.Thread(target=self.send_email,
+                                            args=(subject, content, html_body))
+            email_thread.start()
 
         elif quota_exhausted and not all_summaries:
             # Quota hit before a single summary was produced — nothing useful to send
@@ -950,6 +1579,13 @@ Recommendation: Watch the video directly to get the full analysis."""
         else:
             print("\n📭 No new videos found.")
 
+        if saved_to_db:
+            analyze_database()
+            optimize_database()
+
+        if email_thread:
+            email_thread.join()
+
         print(f"\n{'='*60}")
         print("Check complete!")
         print(f"{'='*60}\n")